@@ -0,0 +1,167 @@
+import math
+import random
+import time
+from fractions import Fraction
+import numpy as np
+
+# Number of games simulated at once
+CHUNK_SIZE = 1_000_000
+
+EULER_GAMMA = 0.5772156649015329
+
+# Guessers pick the next guess for many games at once, given the range
+# [low, high] that still contains each secret (int64 arrays)
+
+def binary_search_guesser(rng, low, high):
+    return low + (high - low) // 2
+
+def random_guesser(rng, low, high):
+    return rng.integers(low, high + 1)
+
+def biased_guesser(bias):
+    """Guess at a fixed fraction of the remaining range (0.5 is binary search)."""
+    bias = Fraction(bias).limit_denominator(1000)
+    numerator, denominator = bias.numerator, bias.denominator
+
+    def guesser(rng, low, high):
+        # Exact floor((high - low) * bias) without overflowing int64
+        span = high - low
+        return low + span // denominator * numerator + span % denominator * numerator // denominator
+
+    guesser.bias = bias
+    return guesser
+
+GUESSERS = {
+    'binary': binary_search_guesser,
+    'random': random_guesser,
+    'biased_0.3': biased_guesser('0.3'),
+    'biased_0.1': biased_guesser('0.1'),
+}
+
+def play_headless(guesser, min_num, max_num, secret=None, rng=None):
+    """Play one game like play_game, without prompts, and return the number of guesses."""
+    rng = rng or np.random.default_rng()
+    if secret is None:
+        secret = random.randint(min_num, max_num)
+    low, high = np.array([min_num], dtype=np.int64), np.array([max_num], dtype=np.int64)
+    guesses = 0
+    while True:
+        guess = int(guesser(rng, low, high)[0])
+        guesses += 1
+        if guess < secret:
+            low[0] = guess + 1
+        elif guess > secret:
+            high[0] = guess - 1
+        else:
+            return guesses
+
+def _simulate_chunk(guesser, rng, min_num, max_num, size):
+    secrets = rng.integers(min_num, max_num + 1, size=size, dtype=np.int64)
+    low = np.full(size, min_num, dtype=np.int64)
+    high = np.full(size, max_num, dtype=np.int64)
+    guesses = np.zeros(size, dtype=np.int64)
+    active = np.arange(size)
+
+    while active.size:
+        guess = guesser(rng, low[active], high[active])
+        guesses[active] += 1
+        secret = secrets[active]
+        too_low = guess < secret
+        too_high = guess > secret
+        low[active[too_low]] = guess[too_low] + 1
+        high[active[too_high]] = guess[too_high] - 1
+        active = active[too_low | too_high]
+    return guesses
+
+def simulate_games(guesser, min_num, max_num, games, seed=None):
+    """Play many games against uniform secrets in [min_num, max_num] and summarise the guess counts."""
+    rng = np.random.default_rng(seed)
+    histogram = np.zeros(0, dtype=np.int64)
+    total = 0
+    for start in range(0, games, CHUNK_SIZE):
+        guesses = _simulate_chunk(guesser, rng, min_num, max_num, min(CHUNK_SIZE, games - start))
+        total += int(guesses.sum())
+        counts = np.bincount(guesses)
+        if counts.size > histogram.size:
+            histogram = np.pad(histogram, (0, counts.size - histogram.size))
+        histogram[:counts.size] += counts
+    return {
+        'games': games,
+        'mean': total / games if games else 0.0,
+        'max': int(np.flatnonzero(histogram)[-1]) if games else 0,
+        'histogram': histogram,
+    }
+
+def split_distribution(range_size, numerator, denominator):
+    """Exact guess-count distribution for a guesser that splits the range at a fixed fraction.
+
+    Returns {guesses: number of secrets found after that many guesses}. Ranges
+    of the same size behave the same, so each level only tracks how many
+    ranges of each size are left, which keeps this fast even for 10^18.
+    """
+    distribution = {}
+    level = {range_size: 1}
+    guesses = 0
+    while level:
+        guesses += 1
+        distribution[guesses] = sum(level.values())
+        next_level = {}
+        for size, count in level.items():
+            left = (size - 1) * numerator // denominator
+            for child in (left, size - 1 - left):
+                if child:
+                    next_level[child] = next_level.get(child, 0) + count
+        level = next_level
+    return distribution
+
+def harmonic_number(n):
+    if n <= 1_000_000:
+        return math.fsum(1 / k for k in range(1, n + 1))
+    return math.log(n) + EULER_GAMMA + 1 / (2 * n) - 1 / (12 * n * n)
+
+def expected_guesses(guesser, min_num, max_num):
+    """Expected number of guesses over uniform secrets, computed without simulating.
+
+    Binary search and biased guessers use their exact distribution. The random
+    guesser follows the random binary search tree result 2 (1 + 1/n) H(n) - 3.
+    """
+    n = max_num - min_num + 1
+    if guesser is random_guesser:
+        return 2 * (1 + 1 / n) * harmonic_number(n) - 3
+    distribution = guess_distribution(guesser, min_num, max_num)
+    return sum(Fraction(guesses * count) for guesses, count in distribution.items()) / n
+
+def guess_distribution(guesser, min_num, max_num):
+    """Exact {guesses: number of secrets} for binary search or a biased guesser."""
+    n = max_num - min_num + 1
+    if guesser is binary_search_guesser:
+        return split_distribution(n, 1, 2)
+    if hasattr(guesser, 'bias'):
+        return split_distribution(n, guesser.bias.numerator, guesser.bias.denominator)
+    raise ValueError("Only binary search and biased guessers have an exact distribution.")
+
+# (name, min_num, max_num, games, seed) for the benchmark suite
+BENCHMARK_CONFIGS = [
+    ('1-100', 1, 100, 1_000_000, 1),
+    ('1-10^6', 1, 10 ** 6, 1_000_000, 2),
+    ('1-10^18', 1, 10 ** 18, 1_000_000, 3),
+]
+
+def benchmark():
+    """Simulate every guesser on every benchmark range with fixed seeds and compare to the analytic mean."""
+    print(f"{'Range':<10} {'Guesser':<12} {'Simulated':>10} {'Analytic':>10} {'Max':>5} {'Seconds':>8} {'ns/game':>8}")
+    print("-" * 70)
+    for range_name, min_num, max_num, games, seed in BENCHMARK_CONFIGS:
+        for guesser_name, guesser in GUESSERS.items():
+            start = time.perf_counter()
+            result = simulate_games(guesser, min_num, max_num, games, seed)
+            elapsed = time.perf_counter() - start
+            analytic = float(expected_guesses(guesser, min_num, max_num))
+            print(f"{range_name:<10} {guesser_name:<12} {result['mean']:>10.3f} {analytic:>10.3f} "
+                  f"{result['max']:>5} {elapsed:>8.2f} {elapsed / games * 1e9:>8.0f}")
+
+def main():
+    benchmark()
+
+if __name__ == "__main__":
+    main()
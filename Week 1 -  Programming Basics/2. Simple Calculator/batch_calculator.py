@@ -0,0 +1,141 @@
+import argparse
+import csv
+import json
+import math
+import sys
+from itertools import islice
+import numpy as np
+from calculator import divide, format_number, operations
+
+# Number of input records processed together
+CHUNK_SIZE = 100_000
+
+# Every way an operation can be written in the input: its number, name,
+# function name or symbol
+OPERATION_ALIASES = {}
+for key, (operation_name, operation_func) in operations.items():
+    for alias in (str(key), operation_name, operation_func.__name__, "+-*/"[key - 1]):
+        OPERATION_ALIASES[alias.lower()] = key
+
+def _parse_numbers(values):
+    """Convert a list of strings to floats, with a flag for missing, invalid
+    or non-finite ones (NumPy turns None into NaN, so NaN counts as invalid)."""
+    try:
+        numbers = np.array(values, dtype=float)
+    except (ValueError, TypeError):
+        numbers = np.empty(len(values))
+        for i, value in enumerate(values):
+            try:
+                numbers[i] = float(value)
+            except (ValueError, TypeError):
+                numbers[i] = np.nan
+    return numbers, ~np.isfinite(numbers)
+
+def calculate_chunk(ops, xs, ys):
+    """Run one chunk of (op, x, y) records and return (results, errors) in input order.
+
+    Records are grouped by operation and each group is a single vectorized call
+    through the operations table. Failed rows get NaN and an error message.
+    """
+    codes = np.array([OPERATION_ALIASES.get(str(op).strip().lower(), 0) for op in ops])
+    x, x_invalid = _parse_numbers(xs)
+    y, y_invalid = _parse_numbers(ys)
+
+    results = np.full(len(codes), np.nan)
+    errors = np.full(len(codes), None, dtype=object)
+    errors[codes == 0] = "Invalid operation"
+
+    invalid = x_invalid | y_invalid
+    errors[invalid & (codes != 0)] = "Invalid number"
+
+    for key, (_, operation_func) in operations.items():
+        rows = (codes == key) & ~invalid
+        if operation_func is divide:
+            zero = rows & (y == 0)
+            errors[zero] = "Cannot divide by zero!"
+            rows &= ~zero
+        rows = np.flatnonzero(rows)
+        if rows.size:
+            with np.errstate(over='ignore'):
+                results[rows] = operation_func(x[rows], y[rows])
+            # Finite inputs can still overflow to infinity
+            overflow = rows[~np.isfinite(results[rows])]
+            errors[overflow] = "Result out of range"
+    return results, errors
+
+def read_records(source, input_format):
+    """Yield (op, x, y) tuples from CSV or JSONL text."""
+    if input_format == 'jsonl':
+        for line in source:
+            if line.strip():
+                try:
+                    record = json.loads(line)
+                    yield record.get('op'), record.get('x'), record.get('y')
+                except (ValueError, AttributeError):
+                    yield None, None, None
+        return
+
+    rows = csv.reader(source)
+    for row in rows:
+        if not row:
+            continue
+        if row[0].strip().lower() == 'op':
+            continue  # header line
+        row = (row + [None, None, None])[:3]
+        yield tuple(row)
+
+def _json_value(value):
+    """Non-finite input numbers (JSON allows NaN on input) are echoed as strings."""
+    return str(value) if isinstance(value, float) and not math.isfinite(value) else value
+
+def write_results(output, output_format, ops, xs, ys, results, errors, writer=None):
+    for op, x, y, result, error in zip(ops, xs, ys, results.tolist(), errors.tolist()):
+        result = None if error else format_number(result)
+        if output_format == 'jsonl':
+            record = {'op': op, 'x': _json_value(x), 'y': _json_value(y), 'result': result, 'error': error}
+            output.write(json.dumps(record, allow_nan=False) + '\n')
+        else:
+            writer.writerow([op, x, y, '' if result is None else result, error or ''])
+
+def run_batch(source, output, input_format='csv', output_format=None, chunk_size=CHUNK_SIZE):
+    """Stream records from source to output, chunk by chunk, and return (rows, errors)."""
+    output_format = output_format or input_format
+    writer = None
+    if output_format == 'csv':
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(['op', 'x', 'y', 'result', 'error'])
+
+    records = read_records(source, input_format)
+    total = failed = 0
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return total, failed
+        ops, xs, ys = zip(*chunk)
+        results, errors = calculate_chunk(ops, xs, ys)
+        write_results(output, output_format, ops, xs, ys, results, errors, writer)
+        total += len(chunk)
+        failed += int(np.count_nonzero(errors.astype(bool)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many calculator operations from a file or stdin.")
+    parser.add_argument('input', nargs='?', default='-', help="CSV or JSONL file with op,x,y records ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="where to write results ('-' for stdout)")
+    parser.add_argument('-f', '--format', choices=['csv', 'jsonl'], help="input format (default: from the file extension, csv for stdin)")
+    parser.add_argument('--output-format', choices=['csv', 'jsonl'], help="output format (default: same as input)")
+    args = parser.parse_args()
+
+    input_format = args.format or ('jsonl' if args.input.endswith(('.jsonl', '.json')) else 'csv')
+    source = sys.stdin if args.input == '-' else open(args.input, newline='')
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+    try:
+        total, failed = run_batch(source, output, input_format, args.output_format)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    print(f"Processed {total} operations ({failed} errors)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -8,21 +8,23 @@ def multiply(x, y):
     return x * y
 
 def divide(x, y):
-    if y == 0:
+    # y can be a single number or a NumPy array of divisors
+    zero = y == 0
+    if zero.any() if hasattr(zero, 'any') else zero:
         raise ValueError("Cannot divide by zero!")
     return x / y
 
 def format_number(num):
     return int(num) if num.is_integer() else num
 
+operations = {
+    1: ("Addition", add),
+    2: ("Subtraction", subtract),
+    3: ("Multiplication", multiply),
+    4: ("Division", divide)
+}
+
 def main():
-    operations = {
-        1: ("Addition", add),
-        2: ("Subtraction", subtract),
-        3: ("Multiplication", multiply),
-        4: ("Division", divide)
-    }
-    
     while True:
         print("\n=== Simple Calculator ===")
         print("Select operation:")
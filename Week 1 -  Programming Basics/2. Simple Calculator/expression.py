@@ -0,0 +1,102 @@
+import ast
+import math
+from functools import lru_cache
+from calculator import add, subtract, multiply, divide
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed to evaluate whole columns
+    np = None
+
+# Number of compiled expressions kept, keyed by their source text
+EXPRESSION_CACHE_SIZE = 256
+
+def safe_divide(x, y):
+    """Divide like calculator.divide, but give NaN instead of an error on division by zero."""
+    if np is not None and (isinstance(x, np.ndarray) or isinstance(y, np.ndarray)):
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        result = np.full(x.shape, np.nan)
+        np.divide(x, y, out=result, where=y != 0)
+        return result
+    try:
+        return divide(x, y)
+    except ValueError:
+        return math.nan
+
+BINARY_OPERATIONS = {
+    ast.Add: add,
+    ast.Sub: subtract,
+    ast.Mult: multiply,
+    ast.Div: safe_divide,
+}
+
+def _compile_node(node, variables):
+    """Turn an AST node into a function of the variable values."""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = node.value
+        return lambda values: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        variables.add(name)
+        return lambda values: values[name]
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _compile_node(node.operand, variables)
+        if isinstance(node.op, ast.USub):
+            return lambda values: -operand(values)
+        return operand
+
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATIONS:
+        operation = BINARY_OPERATIONS[type(node.op)]
+        left = _compile_node(node.left, variables)
+        right = _compile_node(node.right, variables)
+        return lambda values: operation(left(values), right(values))
+
+    raise ValueError(f"Unsupported element in expression: {type(getattr(node, 'op', node)).__name__}")
+
+class CompiledExpression:
+    """An arithmetic expression parsed once and evaluated many times."""
+
+    def __init__(self, source):
+        self.source = source
+        try:
+            tree = ast.parse(source.strip(), mode='eval')
+        except SyntaxError:
+            raise ValueError(f"Invalid expression: {source}") from None
+        variables = set()
+        self._function = _compile_node(tree.body, variables)
+        self.variables = frozenset(variables)
+
+    def evaluate(self, data=None, **variables):
+        """Evaluate with scalars or whole columns (lists, NumPy arrays, DataFrame columns).
+
+        Values come from the data mapping (for example a DataFrame) and from
+        keyword arguments. Division by zero gives NaN instead of an error.
+        """
+        values = {}
+        for name in self.variables:
+            if name in variables:
+                value = variables[name]
+            elif data is not None and name in data:
+                value = data[name]
+            else:
+                raise ValueError(f"No value given for variable '{name}'")
+            if np is not None and not isinstance(value, (int, float)):
+                value = np.asarray(value, dtype=float)
+            values[name] = value
+        return self._function(values)
+
+    __call__ = evaluate
+
+    def __repr__(self):
+        return f"CompiledExpression({self.source!r})"
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(source):
+    """Compile an expression such as '(a + b) * c / 2', reusing earlier compilations."""
+    return CompiledExpression(source)
+
+def evaluate(source, data=None, **variables):
+    """Compile (or fetch from the cache) and evaluate an expression."""
+    return compile_expression(source).evaluate(data, **variables)
@@ -0,0 +1,182 @@
+import time
+from collections import namedtuple
+import numpy as np
+from rock_paper_scissors import determine_winner
+
+CHOICES = ['rock', 'paper', 'scissors']
+
+# OUTCOMES[user][computer] is 1 when the user wins the round, -1 when the
+# computer wins and 0 for a tie, taken from determine_winner itself
+OUTCOMES = np.array([
+    [{'user': 1, 'computer': -1, 'tie': 0}[determine_winner(user, computer)] for computer in CHOICES]
+    for user in CHOICES
+], dtype=np.int8)
+
+# The move that beats each move (index into CHOICES)
+BEATS = np.array([int(np.flatnonzero(OUTCOMES[:, move] == 1)[0]) for move in range(3)], dtype=np.int8)
+
+# Safety limit on rounds per match, since ties can repeat forever
+MAX_ROUNDS = 1000
+
+# Number of matches simulated at once
+CHUNK_SIZE = 1_000_000
+
+# What a strategy sees before each round, for every active match at once:
+# the round number, its own and the opponent's last moves (-1 before the
+# first round) and the last outcome from its own point of view
+History = namedtuple('History', ['round', 'own_last', 'opponent_last', 'last_outcome'])
+
+def random_strategy(rng, history):
+    return rng.integers(0, 3, size=history.own_last.size, dtype=np.int8)
+
+def biased_strategy(weights):
+    """Pick moves at random with the given probabilities for rock, paper and scissors."""
+    probabilities = np.asarray(weights, dtype=float) / np.sum(weights)
+    def strategy(rng, history):
+        return rng.choice(3, size=history.own_last.size, p=probabilities).astype(np.int8)
+    return strategy
+
+def constant_strategy(choice):
+    move = CHOICES.index(choice)
+    def strategy(rng, history):
+        return np.full(history.own_last.size, move, dtype=np.int8)
+    return strategy
+
+# Move rules shared with tournament.py; they take single moves or arrays
+
+def cycle_move(own_last):
+    """The move after own_last in rock, paper, scissors order."""
+    return (own_last + 1) % 3
+
+def win_stay_lose_shift_move(own_last, outcome):
+    """Keep own_last after a win (outcome 1), otherwise play the move that beats it."""
+    return np.where(outcome == 1, own_last, BEATS[own_last])
+
+def cycle_strategy(rng, history):
+    """Play rock, paper, scissors in turn."""
+    return cycle_move(history.own_last).astype(np.int8)
+
+def copy_strategy(rng, history):
+    """Repeat the opponent's last move (random in the first round)."""
+    moves = random_strategy(rng, history)
+    return np.where(history.opponent_last >= 0, history.opponent_last, moves).astype(np.int8)
+
+def counter_strategy(rng, history):
+    """Play the move that beats the opponent's last move."""
+    moves = random_strategy(rng, history)
+    return np.where(history.opponent_last >= 0, BEATS[history.opponent_last], moves).astype(np.int8)
+
+def win_stay_lose_shift(rng, history):
+    """Keep a winning move, otherwise switch to the move that beats it."""
+    moves = random_strategy(rng, history)
+    played = history.own_last >= 0
+    return np.where(played, win_stay_lose_shift_move(history.own_last, history.last_outcome), moves).astype(np.int8)
+
+STRATEGIES = {
+    'random': random_strategy,
+    'rock': constant_strategy('rock'),
+    'biased': biased_strategy([0.5, 0.3, 0.2]),
+    'cycle': cycle_strategy,
+    'copy': copy_strategy,
+    'counter': counter_strategy,
+    'win_stay_lose_shift': win_stay_lose_shift,
+}
+
+def _simulate_chunk(rng, size, best_of, user_strategy, computer_strategy):
+    """Play size matches at once; finished matches drop out of the active set."""
+    games_needed = (best_of // 2) + 1
+    user_score = np.zeros(size, dtype=np.int16)
+    computer_score = np.zeros(size, dtype=np.int16)
+    rounds = np.zeros(size, dtype=np.int32)
+    ties = np.zeros(size, dtype=np.int32)
+
+    active = np.arange(size)
+    user_last = np.full(size, -1, dtype=np.int8)
+    computer_last = np.full(size, -1, dtype=np.int8)
+    outcome = np.zeros(size, dtype=np.int8)
+
+    for round_number in range(MAX_ROUNDS):
+        if not active.size:
+            break
+        user_moves = user_strategy(rng, History(round_number, user_last, computer_last, outcome))
+        computer_moves = computer_strategy(rng, History(round_number, computer_last, user_last, -outcome))
+        outcome = OUTCOMES[user_moves, computer_moves]
+
+        user_score[active] += outcome == 1
+        computer_score[active] += outcome == -1
+        ties[active] += outcome == 0
+        rounds[active] += 1
+
+        # Masked early exit: keep only the matches nobody has won yet
+        still_playing = np.maximum(user_score[active], computer_score[active]) < games_needed
+        active = active[still_playing]
+        user_last = user_moves[still_playing]
+        computer_last = computer_moves[still_playing]
+        outcome = outcome[still_playing]
+
+    return user_score, computer_score, rounds, ties
+
+def simulate_matches(matches, best_of=3, user_strategy=random_strategy, computer_strategy=random_strategy, seed=None):
+    """Simulate many best-of-N matches with the play_game scoring rules.
+
+    Returns a dict with win/unfinished counts and rates, the tie rate per round
+    and a histogram of match lengths (index = number of rounds).
+    """
+    rng = np.random.default_rng(seed)
+    user_wins = computer_wins = unfinished = total_rounds = total_ties = 0
+    length_histogram = np.zeros(0, dtype=np.int64)
+
+    for start in range(0, matches, CHUNK_SIZE):
+        size = min(CHUNK_SIZE, matches - start)
+        user_score, computer_score, rounds, ties = _simulate_chunk(rng, size, best_of, user_strategy, computer_strategy)
+        user_wins += int(np.count_nonzero(user_score > computer_score))
+        computer_wins += int(np.count_nonzero(computer_score > user_score))
+        unfinished += int(np.count_nonzero(user_score == computer_score))
+        total_rounds += int(rounds.sum())
+        total_ties += int(ties.sum())
+
+        counts = np.bincount(rounds)
+        if counts.size > length_histogram.size:
+            length_histogram = np.pad(length_histogram, (0, counts.size - length_histogram.size))
+        length_histogram[:counts.size] += counts
+
+    return {
+        'matches': matches,
+        'user_wins': user_wins,
+        'computer_wins': computer_wins,
+        'unfinished': unfinished,
+        'user_win_rate': user_wins / matches if matches else 0.0,
+        'computer_win_rate': computer_wins / matches if matches else 0.0,
+        'round_tie_rate': total_ties / total_rounds if total_rounds else 0.0,
+        'average_rounds': total_rounds / matches if matches else 0.0,
+        'length_histogram': length_histogram,
+    }
+
+def print_report(name, result):
+    print(f"\n{name}: {result['matches']} matches, {result['average_rounds']:.2f} rounds on average")
+    print(f"  User wins: {result['user_win_rate']:.2%}  Computer wins: {result['computer_win_rate']:.2%}  "
+          f"Round ties: {result['round_tie_rate']:.2%}")
+    histogram = result['length_histogram']
+    for rounds in np.flatnonzero(histogram)[:12]:
+        share = histogram[rounds] / result['matches']
+        print(f"  {rounds:>3} rounds: {share:7.2%} {'#' * round(share * 50)}")
+
+def benchmark(matches=1_000_000, best_of=5, seed=42):
+    """Time every strategy against a random opponent and print the cost per match."""
+    print(f"{'Strategy':<22} {'Matches':>10} {'Seconds':>8} {'ns/match':>10} {'Win rate':>9}")
+    print("-" * 63)
+    for name, strategy in STRATEGIES.items():
+        start = time.perf_counter()
+        result = simulate_matches(matches, best_of, strategy, random_strategy, seed)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {matches:>10} {elapsed:>8.2f} {elapsed / matches * 1e9:>10.0f} {result['user_win_rate']:>9.2%}")
+
+def main():
+    for best_of in (3, 5):
+        result = simulate_matches(1_000_000, best_of, seed=42)
+        print_report(f"Random vs random, best of {best_of}", result)
+    print()
+    benchmark()
+
+if __name__ == "__main__":
+    main()
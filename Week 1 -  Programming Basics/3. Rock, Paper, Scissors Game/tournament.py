@@ -0,0 +1,181 @@
+import argparse
+import os
+import random
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from simulator import BEATS, CHOICES, MAX_ROUNDS, OUTCOMES, cycle_move, win_stay_lose_shift_move
+
+# Players work with move indices into CHOICES and round outcomes from their
+# own point of view (1 win, -1 loss, 0 tie), like the simulator's strategies
+
+class RandomPlayer:
+    name = 'random'
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def choose(self):
+        return self.rng.randrange(len(CHOICES))
+
+    def update(self, own_move, opponent_move, outcome):
+        """Learn from a finished round."""
+
+class FrequencyPlayer(RandomPlayer):
+    """Beat the move the opponent has played most often so far."""
+    name = 'frequency'
+
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.counts = [0] * len(CHOICES)
+
+    def choose(self):
+        most_common = max(self.counts)
+        if not most_common:
+            return super().choose()
+        return int(BEATS[self.rng.choice([move for move, count in enumerate(self.counts) if count == most_common])])
+
+    def update(self, own_move, opponent_move, outcome):
+        self.counts[opponent_move] += 1
+
+class MarkovPlayer(RandomPlayer):
+    """Predict the opponent's next move from their last `order` moves (an n-gram model)."""
+
+    def __init__(self, rng, order=2):
+        super().__init__(rng)
+        self.name = f'markov{order}'
+        self.order = order
+        self.context = ()
+        self.counts = defaultdict(lambda: [0] * len(CHOICES))
+
+    def choose(self):
+        counts = self.counts.get(self.context)
+        if not counts:
+            return super().choose()
+        most_common = max(counts)
+        return int(BEATS[self.rng.choice([move for move, count in enumerate(counts) if count == most_common])])
+
+    def update(self, own_move, opponent_move, outcome):
+        if len(self.context) == self.order:
+            self.counts[self.context][opponent_move] += 1
+        self.context = (self.context + (opponent_move,))[-self.order:]
+
+class WinStayLoseShiftPlayer(RandomPlayer):
+    """Keep a winning move, otherwise switch to the move that beats it."""
+    name = 'win_stay_lose_shift'
+
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.next_move = None
+
+    def choose(self):
+        return super().choose() if self.next_move is None else self.next_move
+
+    def update(self, own_move, opponent_move, outcome):
+        self.next_move = int(win_stay_lose_shift_move(own_move, outcome))
+
+class CyclePlayer(RandomPlayer):
+    """Play rock, paper, scissors in turn."""
+    name = 'cycle'
+
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.move = rng.randrange(len(CHOICES))
+
+    def choose(self):
+        return self.move
+
+    def update(self, own_move, opponent_move, outcome):
+        self.move = cycle_move(self.move)
+
+PLAYERS = {
+    'random': RandomPlayer,
+    'frequency': FrequencyPlayer,
+    'markov1': lambda rng: MarkovPlayer(rng, order=1),
+    'markov2': lambda rng: MarkovPlayer(rng, order=2),
+    'win_stay_lose_shift': WinStayLoseShiftPlayer,
+    'cycle': CyclePlayer,
+}
+
+def play_match(player_a, player_b, best_of):
+    """Play one match with the play_game scoring rules and return (score_a, score_b, rounds)."""
+    score_a = score_b = rounds = 0
+    games_needed = (best_of // 2) + 1
+
+    while max(score_a, score_b) < games_needed and rounds < MAX_ROUNDS:
+        move_a, move_b = player_a.choose(), player_b.choose()
+        outcome = int(OUTCOMES[move_a, move_b])
+        score_a += outcome == 1
+        score_b += outcome == -1
+        rounds += 1
+        player_a.update(move_a, move_b, outcome)
+        player_b.update(move_b, move_a, -outcome)
+    return score_a, score_b, rounds
+
+def run_task(task):
+    """Play a series of matches for one pairing, seed and best_of setting.
+
+    Each player gets its own random stream derived from the task, so results
+    do not depend on which worker runs the task. Players keep their state for
+    the whole series. Only the totals are returned.
+    """
+    name_a, name_b, seed, best_of, matches = task
+    player_a = PLAYERS[name_a](random.Random(f'{seed}:{best_of}:{name_a}:{name_b}:a'))
+    player_b = PLAYERS[name_b](random.Random(f'{seed}:{best_of}:{name_a}:{name_b}:b'))
+
+    wins_a = wins_b = total_rounds = 0
+    for _ in range(matches):
+        score_a, score_b, rounds = play_match(player_a, player_b, best_of)
+        wins_a += score_a > score_b
+        wins_b += score_b > score_a
+        total_rounds += rounds
+    return name_a, name_b, wins_a, wins_b, matches, total_rounds
+
+def run_tournament(players=None, seeds=range(10), best_of_values=(3, 5), matches=200, workers=None):
+    """Play every pair of players for every seed and best_of setting on a process pool.
+
+    Returns the leaderboard as a list of dicts, best win rate first.
+    """
+    players = list(players or PLAYERS)
+    tasks = [
+        (name_a, name_b, seed, best_of, matches)
+        for name_a, name_b in combinations(players, 2)
+        for seed in seeds
+        for best_of in best_of_values
+    ]
+
+    table = {name: {'player': name, 'matches': 0, 'wins': 0, 'losses': 0, 'rounds': 0} for name in players}
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as executor:
+        chunksize = max(1, len(tasks) // (4 * workers))
+        for name_a, name_b, wins_a, wins_b, played, rounds in executor.map(run_task, tasks, chunksize=chunksize):
+            for name, wins, losses in ((name_a, wins_a, wins_b), (name_b, wins_b, wins_a)):
+                table[name]['matches'] += played
+                table[name]['wins'] += wins
+                table[name]['losses'] += losses
+                table[name]['rounds'] += rounds
+
+    for row in table.values():
+        row['win_rate'] = row['wins'] / row['matches'] if row['matches'] else 0.0
+    return sorted(table.values(), key=lambda row: row['win_rate'], reverse=True)
+
+def print_leaderboard(leaderboard):
+    print(f"{'#':>2} {'Player':<22} {'Matches':>8} {'Wins':>8} {'Losses':>8} {'Win rate':>9}")
+    print("-" * 62)
+    for rank, row in enumerate(leaderboard, 1):
+        print(f"{rank:>2} {row['player']:<22} {row['matches']:>8} {row['wins']:>8} {row['losses']:>8} {row['win_rate']:>9.2%}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a round-robin tournament between computer strategies.")
+    parser.add_argument('--seeds', type=int, default=10, help="number of seeds per pairing")
+    parser.add_argument('--best-of', type=int, nargs='+', default=[3, 5])
+    parser.add_argument('--matches', type=int, default=200, help="matches per pairing, seed and best_of")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="number of processes (default: all cores)")
+    args = parser.parse_args()
+
+    leaderboard = run_tournament(seeds=range(args.seeds), best_of_values=args.best_of,
+                                 matches=args.matches, workers=args.workers)
+    print_leaderboard(leaderboard)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import random
+import string
+import time
+from password_checker import PasswordStrengthChecker, character_classes
+from patterns import estimate_guesses
+
+def sample_passwords(count, seed=42):
+    """Generate a reproducible mix of random and pattern-based passwords."""
+    rng = random.Random(seed)
+    words = ['password', 'summer', 'dragon', 'monkey', 'qwerty', 'letmein', 'football']
+    passwords = []
+    for _ in range(count):
+        kind = rng.randrange(4)
+        if kind == 0:
+            length = rng.randint(6, 20)
+            passwords.append(''.join(rng.choices(string.ascii_letters + string.digits + string.punctuation, k=length)))
+        elif kind == 1:
+            passwords.append(rng.choice(words).capitalize() + str(rng.randint(1950, 2030)) + rng.choice('!@#$'))
+        elif kind == 2:
+            passwords.append(rng.choice(['qwerty', 'asdfgh', 'zxcvbn', 'abcdef', '123456']) + rng.choice(words))
+        else:
+            # Non-ASCII letters, some of which change length when lowercased
+            passwords.append(rng.choice(['İ', 'ß', 'ǅ', 'é', 'ﬀ']) + rng.choice(words) + str(rng.randint(0, 99)))
+    return passwords
+
+def measure(function, passwords):
+    """Return the per-call latencies of a function in microseconds."""
+    latencies = []
+    for password in passwords:
+        start = time.perf_counter()
+        function(password)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return sorted(latencies)
+
+def main():
+    checker = PasswordStrengthChecker()
+    passwords = sample_passwords(20000)
+
+    print(f"{'Step':<22} {'p50 (us)':>10} {'p99 (us)':>10} {'mean (us)':>10}")
+    print("-" * 55)
+    for name, function in (
+        ("character classes", character_classes),
+        ("pattern matching", estimate_guesses),
+        ("check_strength", checker.check_strength),
+    ):
+        latencies = measure(function, passwords)
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[int(len(latencies) * 0.99)]
+        print(f"{name:<22} {p50:>10.1f} {p99:>10.1f} {sum(latencies) / len(latencies):>10.1f}")
+
+if __name__ == "__main__":
+    main()
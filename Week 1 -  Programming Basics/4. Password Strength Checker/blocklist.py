@@ -0,0 +1,157 @@
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+# File layout: header, Bloom filter bits, sorted array of 64-bit password hashes.
+# Both sections start on an 8-byte boundary so the hashes can be read in place.
+MAGIC = b'PWBLOCK1'
+BYTE_ORDER_MARK = 0x0102030405060708
+HEADER = struct.Struct('=8sQQQQ')
+HEADER_SIZE = 64
+
+# Number of hashes sorted in memory at once while building
+RUN_SIZE = 5_000_000
+
+def password_hash(password):
+    """Return the 64-bit hash stored in the blocklist for a password."""
+    digest = hashlib.blake2b(password.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+def bloom_positions(key, bit_count, hash_count):
+    """Return the Bloom filter bit positions for a hash (double hashing)."""
+    step = (key >> 32) | 1
+    return [(key + i * step) % bit_count for i in range(hash_count)]
+
+def _write_sorted_runs(source_path, run_dir):
+    """Hash every password in the source file into sorted run files."""
+    runs = []
+    total = 0
+    hashes = []
+
+    def flush():
+        run = array('Q', sorted(set(hashes)))
+        path = os.path.join(run_dir, f'run{len(runs)}.bin')
+        with open(path, 'wb') as f:
+            run.tofile(f)
+        runs.append(path)
+        hashes.clear()
+
+    with open(source_path, 'rb') as f:
+        for line in f:
+            password = line.rstrip(b'\r\n').decode('utf-8', 'replace').lower()
+            if not password:
+                continue
+            hashes.append(password_hash(password))
+            total += 1
+            if len(hashes) == RUN_SIZE:
+                flush()
+    if hashes:
+        flush()
+    return runs, total
+
+def _read_run(path):
+    """Yield the hashes stored in a run file in order."""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = array('Q')
+            chunk.frombytes(f.read(8 * 65536))
+            if not chunk:
+                return
+            yield from chunk
+
+def build_blocklist(source_path, output_path, false_positive_rate=0.001):
+    """Turn a plaintext password list (one per line) into a blocklist file."""
+    with tempfile.TemporaryDirectory() as run_dir:
+        runs, total = _write_sorted_runs(source_path, run_dir)
+
+        # Size the Bloom filter for the number of entries read
+        bit_count = max(64, math.ceil(-max(total, 1) * math.log(false_positive_rate) / math.log(2) ** 2))
+        bit_count = -(-bit_count // 64) * 64
+        hash_count = max(1, round(bit_count / max(total, 1) * math.log(2)))
+        bloom = bytearray(bit_count // 8)
+
+        temp_path = str(output_path) + '.tmp'
+        with open(temp_path, 'wb') as f:
+            # Hashes go after the header and the Bloom filter; both are written last
+            f.seek(HEADER_SIZE + len(bloom))
+            count = 0
+            previous = None
+            buffer = array('Q')
+            for key in heapq.merge(*(_read_run(path) for path in runs)):
+                if key == previous:
+                    continue
+                previous = key
+                count += 1
+                for position in bloom_positions(key, bit_count, hash_count):
+                    bloom[position >> 3] |= 1 << (position & 7)
+                buffer.append(key)
+                if len(buffer) == 65536:
+                    buffer.tofile(f)
+                    buffer = array('Q')
+            buffer.tofile(f)
+
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, BYTE_ORDER_MARK, count, bit_count, hash_count).ljust(HEADER_SIZE, b'\0'))
+            f.write(bloom)
+
+    os.replace(temp_path, output_path)
+    return count
+
+class Blocklist:
+    """Read-only, memory-mapped set of blocked passwords."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, byte_order, count, bit_count, hash_count = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or byte_order != BYTE_ORDER_MARK:
+            self._mm.close()
+            raise ValueError(f"{path} is not a blocklist file built on this platform.")
+
+        self._bit_count = bit_count
+        self._hash_count = hash_count
+        hashes_start = HEADER_SIZE + bit_count // 8
+        self._bloom = memoryview(self._mm)[HEADER_SIZE:hashes_start]
+        self._hashes = memoryview(self._mm)[hashes_start:hashes_start + 8 * count].cast('Q')
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def __contains__(self, password):
+        key = password_hash(password)
+
+        # The Bloom filter rules out almost every password that is not listed
+        for position in bloom_positions(key, self._bit_count, self._hash_count):
+            if not self._bloom[position >> 3] >> (position & 7) & 1:
+                return False
+
+        # Confirm with a binary search over the sorted hashes
+        index = bisect_left(self._hashes, key)
+        return index < len(self._hashes) and self._hashes[index] == key
+
+    def close(self):
+        self._bloom.release()
+        self._hashes.release()
+        self._mm.close()
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python blocklist.py <passwords.txt> <output.bin>")
+        sys.exit(1)
+
+    source_path, output_path = sys.argv[1], sys.argv[2]
+    count = build_blocklist(source_path, output_path)
+    size = Path(output_path).stat().st_size
+    print(f"Wrote {count} unique passwords to {output_path} ({size / 1024 / 1024:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
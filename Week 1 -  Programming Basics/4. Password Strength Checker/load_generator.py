@@ -0,0 +1,67 @@
+import argparse
+import asyncio
+import json
+import time
+from benchmark_checker import sample_passwords
+
+async def open_connection(host, port, unix_path):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+async def run_client(passwords, host, port, unix_path, latencies):
+    """Send passwords one request at a time over a single connection."""
+    reader, writer = await open_connection(host, port, unix_path)
+    for password in passwords:
+        start = time.perf_counter()
+        writer.write(json.dumps({'password': password}).encode('utf-8') + b'\n')
+        await writer.drain()
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+
+async def fetch_stats(host, port, unix_path):
+    reader, writer = await open_connection(host, port, unix_path)
+    writer.write(b'{"command": "stats"}\n')
+    await writer.drain()
+    stats = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return stats
+
+async def run_load(connections, requests, distinct, host, port, unix_path):
+    """Spread requests over concurrent connections and print client and server numbers."""
+    passwords = sample_passwords(distinct)
+    latencies = []
+    per_connection = requests // connections
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_client([passwords[(i * per_connection + j) % distinct] for j in range(per_connection)],
+                   host, port, unix_path, latencies)
+        for i in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"Sent {len(latencies)} requests over {connections} connections in {elapsed:.2f}s")
+    print(f"Throughput: {len(latencies) / elapsed:.0f} requests/s")
+    print(f"Client latency p50: {latencies[len(latencies) // 2] * 1000:.3f} ms, "
+          f"p99: {latencies[int(len(latencies) * 0.99)] * 1000:.3f} ms")
+    print(f"Server stats: {await fetch_stats(host, port, unix_path)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate load against a running password check service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="connect to this Unix socket path instead of TCP")
+    parser.add_argument('-c', '--connections', type=int, default=50)
+    parser.add_argument('-n', '--requests', type=int, default=100_000)
+    parser.add_argument('--distinct', type=int, default=20_000, help="number of different passwords to send")
+    args = parser.parse_args()
+
+    asyncio.run(run_load(args.connections, args.requests, args.distinct, args.host, args.port, args.unix))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from password_checker import BLOCKLIST_PATH, PasswordStrengthChecker
+
+STRENGTH_LEVELS = ["Very Weak", "Weak", "Moderate", "Strong", "Very Strong"]
+
+# Checker created once per worker process (set by _init_worker)
+_worker_checker = None
+
+def _init_worker(blocklist_path):
+    global _worker_checker
+    _worker_checker = PasswordStrengthChecker(blocklist_path)
+
+def _check_chunk(passwords):
+    """Check a chunk of passwords inside a worker process."""
+    return _worker_checker.check_many(passwords)
+
+def _read_chunks(lines, chunk_size):
+    """Split a stream of lines into lists of passwords without line endings."""
+    passwords = (line.rstrip('\r\n') for line in lines)
+    while True:
+        chunk = list(islice(passwords, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def audit_passwords(lines, workers=None, chunk_size=10000, blocklist_path=BLOCKLIST_PATH):
+    """Check a stream of passwords and yield (password, result) pairs in input order.
+
+    Chunks are checked in a process pool with a bounded number of chunks in
+    flight, so memory stays flat no matter how long the stream is.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _read_chunks(lines, chunk_size)
+
+    if workers == 1:
+        checker = PasswordStrengthChecker(blocklist_path)
+        for chunk in chunks:
+            yield from zip(chunk, checker.check_many(chunk))
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(blocklist_path,)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, executor.submit(_check_chunk, chunk)))
+            if len(pending) >= 2 * workers:
+                chunk, future = pending.popleft()
+                yield from zip(chunk, future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            yield from zip(chunk, future.result())
+
+def write_results(results, output, output_format='jsonl', include_passwords=False):
+    """Write audit results to a file object as they arrive and return a strength histogram."""
+    histogram = Counter()
+    fields = ['line', 'password', 'strength', 'score', 'feedback'] if include_passwords else ['line', 'strength', 'score', 'feedback']
+    writer = None
+    if output_format == 'csv':
+        writer = csv.writer(output)
+        writer.writerow(fields)
+
+    for line_number, (password, result) in enumerate(results, 1):
+        histogram[result['strength']] += 1
+        row = {'line': line_number, 'password': password, **result}
+        if writer:
+            row['feedback'] = '; '.join(result['feedback'])
+            writer.writerow([row[field] for field in fields])
+        else:
+            output.write(json.dumps({field: row[field] for field in fields}) + '\n')
+    return histogram
+
+def print_histogram(histogram):
+    total = sum(histogram.values())
+    print(f"\nAudited {total} passwords", file=sys.stderr)
+    for level in STRENGTH_LEVELS:
+        count = histogram[level]
+        share = count / total if total else 0
+        print(f"{level:>12}: {count:>10} ({share:6.1%}) {'#' * round(share * 50)}", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the strength of many passwords at once.")
+    parser.add_argument('input', nargs='?', default='-', help="file with one password per line ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="where to write results ('-' for stdout)")
+    parser.add_argument('-f', '--format', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('-w', '--workers', type=int, default=None, help="number of processes (default: all cores)")
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--include-passwords', action='store_true', help="write the passwords into the results")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8', errors='replace')
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        results = audit_passwords(source, args.workers, args.chunk_size)
+        histogram = write_results(results, output, args.format, args.include_passwords)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    print_histogram(histogram)
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,55 @@ import re
 import string
 import json
 from pathlib import Path
+from blocklist import Blocklist
+from patterns import entropy_bits, estimate_guesses, guesses_to_score
+
+# Blocklist built with blocklist.py; used instead of the built-in list when present
+BLOCKLIST_PATH = Path(__file__).with_name('common_passwords.bin')
+
+# Character classes, and a translation table that maps every ASCII character
+# to its class so a password can be classified in a single pass
+UPPER, LOWER, DIGIT, SPECIAL = 'U', 'L', 'D', 'S'
+CHARACTER_CLASSES = {UPPER, LOWER, DIGIT, SPECIAL}
+CLASS_TABLE = dict.fromkeys(range(128))
+for chars, character_class in ((string.ascii_uppercase, UPPER), (string.ascii_lowercase, LOWER),
+                               (string.digits, DIGIT), (string.punctuation, SPECIAL)):
+    CLASS_TABLE.update(str.maketrans(chars, character_class * len(chars)))
+
+# Feedback for patterns that make a password easy to guess
+PATTERN_FEEDBACK = {
+    'dictionary': "Avoid common words and passwords",
+    'keyboard': "Avoid keyboard patterns like 'qwerty' or 'asdf'",
+    'sequence': "Avoid sequences like 'abc' or '123'",
+    'repeat': "Avoid repeated characters or words",
+    'date': "Avoid dates and years",
+}
+
+# Patterns only get feedback when they leave fewer guesses than this
+PATTERN_FEEDBACK_GUESSES = 1e8
+
+def character_classes(password):
+    """Return the set of character classes used in a password."""
+    classes = set(password.translate(CLASS_TABLE))
+    # Anything left over is a non-ASCII character
+    for c in classes - CHARACTER_CLASSES:
+        classes.discard(c)
+        if c.isupper():
+            classes.add(UPPER)
+        elif c.islower():
+            classes.add(LOWER)
+        elif c.isdigit():
+            classes.add(DIGIT)
+    return classes
 
 class PasswordStrengthChecker:
-    def __init__(self):
-        self.common_passwords = self._load_common_passwords()
+    def __init__(self, blocklist_path=BLOCKLIST_PATH):
+        self.common_passwords = self._load_common_passwords(blocklist_path)
         
-    def _load_common_passwords(self):
-        # In a real application, you might want to load this from a file
+    def _load_common_passwords(self, blocklist_path):
+        # Memory-map the blocklist file so startup does not depend on its size
+        if blocklist_path and Path(blocklist_path).exists():
+            return Blocklist(blocklist_path)
         return {
             '123456', 'password', 'qwerty', 'abc123', 'letmein',
             'admin', '123456789', '12345', 'welcome', 'password1'
@@ -24,27 +66,28 @@ class PasswordStrengthChecker:
         else:
             score += len(password) // 8
             
+        classes = character_classes(password)
+        
         # Check for uppercase letters
-        if not any(c.isupper() for c in password):
+        if UPPER not in classes:
             feedback.append("Add uppercase letters")
         else:
             score += 1
             
         # Check for lowercase letters
-        if not any(c.islower() for c in password):
+        if LOWER not in classes:
             feedback.append("Add lowercase letters")
         else:
             score += 1
             
         # Check for numbers
-        if not any(c.isdigit() for c in password):
+        if DIGIT not in classes:
             feedback.append("Add numbers")
         else:
             score += 1
             
         # Check for special characters
-        special_chars = set(string.punctuation)
-        if not any(c in special_chars for c in password):
+        if SPECIAL not in classes:
             feedback.append("Add special characters (!@#$%^&*etc.)")
         else:
             score += 1
@@ -53,6 +96,17 @@ class PasswordStrengthChecker:
         if password.lower() in self.common_passwords:
             score = 0
             feedback.append("This is a commonly used password. Please choose a different one")
+        
+        # Check for guessable patterns (words, keyboard walks, sequences, ...)
+        guesses, matches = estimate_guesses(password)
+        if guesses < PATTERN_FEEDBACK_GUESSES and score > 0:
+            for pattern in dict.fromkeys(match.pattern for match in matches):
+                feedback.append(PATTERN_FEEDBACK[pattern])
+        
+        # A password is no stronger than its guessable patterns allow, so a
+        # word with a digit and symbol suffix cannot score on variety alone
+        pattern_score = guesses_to_score(guesses)
+        score = min(score, pattern_score + 1)
             
         # Calculate strength level
         strength = self._get_strength_level(score)
@@ -60,7 +114,9 @@ class PasswordStrengthChecker:
         return {
             'strength': strength,
             'score': score,
-            'feedback': feedback
+            'feedback': feedback,
+            'entropy': round(entropy_bits(guesses), 1),
+            'pattern_score': pattern_score
         }
     
     def _get_strength_level(self, score):
@@ -75,9 +131,15 @@ class PasswordStrengthChecker:
         else:
             return "Very Strong"
     
-    def suggest_improvements(self, password):
-        result = self.check_strength(password)
-        suggestions = result['feedback']
+    def check_many(self, passwords):
+        """Check an iterable of passwords and return a list of results."""
+        return [self.check_strength(password) for password in passwords]
+    
+    def suggest_improvements(self, password, result=None):
+        # Reuse an already computed check_strength result when one is given
+        if result is None:
+            result = self.check_strength(password)
+        suggestions = list(result['feedback'])
         
         if not suggestions:
             return ["Your password is already strong!"]
@@ -110,7 +172,7 @@ def main():
         
         if result['feedback']:
             print("\nImprovement suggestions:")
-            suggestions = checker.suggest_improvements(password)
+            suggestions = checker.suggest_improvements(password, result)
             for suggestion in suggestions:
                 print(f"- {suggestion}")
         else:
@@ -0,0 +1,216 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict, deque
+from password_checker import BLOCKLIST_PATH, PasswordStrengthChecker
+
+# Largest batch handed to the checker at once, and how long to wait for it to fill
+BATCH_SIZE = 256
+BATCH_WAIT = 0.002
+
+CACHE_SIZE = 100_000
+
+# Number of recent request latencies kept for the percentiles
+LATENCY_SAMPLES = 10_000
+
+# Longest request line in bytes; a longer line gets an error reply and
+# the connection is closed, since the rest of it cannot be framed reliably
+REQUEST_LIMIT = 64 * 1024
+
+class ResultCache:
+    """LRU cache of check results keyed by a salted hash of the password.
+
+    The salt is random per process, so the keys cannot be matched against
+    precomputed hashes, and plaintext passwords are never stored.
+    """
+
+    def __init__(self, max_size=CACHE_SIZE):
+        self.max_size = max_size
+        self._salt = os.urandom(16)
+        self._entries = OrderedDict()
+
+    def key(self, password):
+        return hashlib.blake2b(password.encode('utf-8'), key=self._salt, digest_size=16).digest()
+
+    def get(self, key):
+        response = self._entries.get(key)
+        if response is not None:
+            self._entries.move_to_end(key)
+        return response
+
+    def put(self, key, response):
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+class PasswordCheckService:
+    """Keeps a checker loaded and answers newline-delimited JSON requests.
+
+    Each request line is {"password": "..."} and gets the check_strength
+    result back as one JSON line. {"command": "stats"} returns the counters.
+    """
+
+    def __init__(self, blocklist_path=BLOCKLIST_PATH, batch_size=BATCH_SIZE, batch_wait=BATCH_WAIT, cache_size=CACHE_SIZE):
+        self.checker = PasswordStrengthChecker(blocklist_path)
+        self.cache = ResultCache(cache_size)
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self._queue = None
+        self._batcher = None
+        self._started = time.monotonic()
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.counters = {'requests': 0, 'cache_hits': 0, 'batches': 0, 'errors': 0}
+
+    async def _run_batches(self):
+        """Collect queued requests into batches and check each batch at once."""
+        while True:
+            batch = [await self._queue.get()]
+            deadline = asyncio.get_running_loop().time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.counters['batches'] += 1
+            try:
+                results = self.checker.check_many(password for password, _, _ in batch)
+            except Exception:
+                # Check the batch one by one so only the failing requests get the error
+                for item in batch:
+                    self._answer_one(*item)
+                continue
+            for (_, key, future), result in zip(batch, results):
+                self._answer(key, future, result)
+
+    def _answer(self, key, future, result):
+        response = json.dumps(result).encode('utf-8') + b'\n'
+        self.cache.put(key, response)
+        if not future.done():
+            future.set_result(response)
+
+    def _answer_one(self, password, key, future):
+        try:
+            result = self.checker.check_strength(password)
+        except Exception as exc:
+            if not future.done():
+                future.set_exception(exc)
+            return
+        self._answer(key, future, result)
+
+    async def check(self, password):
+        """Return the encoded result line for a password, from the cache when possible."""
+        key = self.cache.key(password)
+        response = self.cache.get(key)
+        if response is not None:
+            self.counters['cache_hits'] += 1
+            return response
+        if self._batcher is None or self._batcher.done():
+            raise RuntimeError("password check batcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((password, key, future))
+        # Stop waiting if the batcher dies instead of answering
+        await asyncio.wait((future, self._batcher), return_when=asyncio.FIRST_COMPLETED)
+        if not future.done():
+            raise RuntimeError("password check batcher stopped")
+        return future.result()
+
+    def stats(self):
+        latencies = sorted(self._latencies)
+        uptime = time.monotonic() - self._started
+
+        def percentile(fraction):
+            return round(latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] * 1000, 3) if latencies else None
+
+        return {
+            **self.counters,
+            'cache_size': len(self.cache),
+            'uptime_seconds': round(uptime, 1),
+            'requests_per_second': round(self.counters['requests'] / uptime, 1) if uptime else 0,
+            'p50_ms': percentile(0.5),
+            'p99_ms': percentile(0.99),
+        }
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    self.counters['errors'] += 1
+                    writer.write(b'{"error": "request line too long"}\n')
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                start = time.perf_counter()
+                try:
+                    request = json.loads(line)
+                    if request.get('command') == 'stats':
+                        writer.write(json.dumps(self.stats()).encode('utf-8') + b'\n')
+                        await writer.drain()
+                        continue
+                    password = request['password']
+                    if not isinstance(password, str):
+                        raise TypeError("password must be a string")
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    self.counters['errors'] += 1
+                    response = b'{"error": "expected {\\"password\\": \\"...\\"}"}\n'
+                else:
+                    try:
+                        response = await self.check(password)
+                    except Exception:
+                        self.counters['errors'] += 1
+                        response = b'{"error": "password check failed"}\n'
+                writer.write(response)
+                await writer.drain()
+                self.counters['requests'] += 1
+                self._latencies.append(time.perf_counter() - start)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765, unix_path=None):
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._run_batches())
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_connection, unix_path, limit=REQUEST_LIMIT)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port, limit=REQUEST_LIMIT)
+        print(f"Password check service listening on {unix_path or f'{host}:{port}'}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._batcher.cancel()
+            if unix_path and os.path.exists(unix_path):
+                os.remove(unix_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the password checker as a long-running service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="listen on this Unix socket path instead of TCP")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE)
+    args = parser.parse_args()
+
+    service = PasswordCheckService(batch_size=args.batch_size, cache_size=args.cache_size)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        print("\nService stopped.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+import math
+import re
+from collections import deque, namedtuple
+from datetime import date
+
+# A pattern found in a password: characters [start, end), how many guesses
+# an attacker needs to hit it, and which kind of pattern it is
+Match = namedtuple('Match', ['start', 'end', 'guesses', 'pattern'])
+
+# Guesses per character when no pattern applies
+BRUTEFORCE_CARDINALITY = 10
+
+# Lower bound on the guesses for a single-character and a longer match
+MIN_GUESSES_SINGLE = 10
+MIN_GUESSES_MULTI = 50
+
+# Only this many leading characters are searched for patterns; the rest
+# count as brute force. Keeps matching fast on arbitrarily long input and
+# bounds the repeat matcher's recursion to a few levels.
+MAX_MATCH_LENGTH = 128
+
+REFERENCE_YEAR = date.today().year
+MIN_YEAR_SPACE = 20
+
+# Common passwords and words, most common first (the rank is the guess count)
+COMMON_WORDS = (
+    'password', '123456', '12345678', 'qwerty', 'abc123', '123456789', '12345', '1234',
+    '111111', '1234567', 'dragon', '123123', 'baseball', 'iloveyou', 'trustno1', 'sunshine',
+    'master', 'welcome', 'shadow', 'ashley', 'football', 'jesus', 'michael', 'ninja',
+    'mustang', 'password1', 'letmein', 'monkey', 'admin', 'login', 'princess', 'solo',
+    'starwars', 'hello', 'freedom', 'whatever', 'qazwsx', 'passw0rd', 'charlie', 'superman',
+    'batman', 'access', 'flower', 'hottie', 'loveme', 'zaq1zaq1', 'secret', 'summer',
+    'winter', 'spring', 'autumn', 'love', 'god', 'money', 'house', 'family', 'friend',
+    'computer', 'internet', 'server', 'system', 'user', 'guest', 'test', 'default', 'root',
+    'pass', 'word', 'secure', 'change', 'changeme', 'orange', 'banana', 'apple', 'cookie',
+    'chocolate', 'pepper', 'tiger', 'lion', 'bear', 'eagle', 'dog', 'cat', 'soccer',
+    'hockey', 'tennis', 'killer', 'pokemon', 'matrix', 'hunter', 'ranger', 'buster',
+    'thomas', 'jordan', 'daniel', 'andrew', 'joshua', 'jennifer', 'jessica', 'maggie',
+    'london', 'paris', 'berlin', 'america', 'canada', 'blue', 'red', 'green', 'black',
+    'white', 'silver', 'golden', 'purple', 'yellow', 'happy', 'lucky', 'magic', 'star',
+    'sun', 'moon', 'angel', 'heart', 'baby', 'girl', 'boy', 'king', 'queen', 'prince',
+)
+
+# US keyboard rows, unshifted and shifted
+KEYBOARD_ROWS = ("`1234567890-=", "qwertyuiop[]\\", "asdfghjkl;'", "zxcvbnm,./")
+SHIFTED_ROWS = ("~!@#$%^&*()_+", "QWERTYUIOP{}|", 'ASDFGHJKL:"', "ZXCVBNM<>?")
+
+# (row, column) of every key, shifted or not
+KEYBOARD_POSITIONS = {
+    key: (row, col)
+    for rows in (KEYBOARD_ROWS, SHIFTED_ROWS)
+    for row, keys in enumerate(rows)
+    for col, key in enumerate(keys)
+}
+
+def _build_keyboard_graph(positions):
+    """Map every key to the set of keys next to it (rows are staggered to the right)."""
+    keys_at = {}
+    for key, position in positions.items():
+        keys_at.setdefault(position, []).append(key)
+
+    graph = {}
+    for key, (row, col) in positions.items():
+        neighbours = set()
+        for position in ((row, col - 1), (row, col + 1), (row - 1, col), (row - 1, col + 1),
+                         (row + 1, col - 1), (row + 1, col)):
+            neighbours.update(keys_at.get(position, ()))
+        graph[key] = neighbours
+    return graph
+
+KEYBOARD_GRAPH = _build_keyboard_graph(KEYBOARD_POSITIONS)
+KEYBOARD_STARTING_KEYS = len(KEYBOARD_GRAPH) // 2
+# Shifted and unshifted versions of a key count as one neighbour
+KEYBOARD_AVERAGE_DEGREE = sum(len(n) for n in KEYBOARD_GRAPH.values()) / len(KEYBOARD_GRAPH) / 2
+
+class WordAutomaton:
+    """Aho-Corasick automaton that finds every dictionary word in a text in one pass."""
+
+    def __init__(self, words):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for rank, word in enumerate(words, 1):
+            state = 0
+            for char in word:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append((len(word), rank))
+
+        # Breadth-first pass to set the failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                if state:
+                    fail = self._fail[state]
+                    while fail and char not in self._goto[fail]:
+                        fail = self._fail[fail]
+                    self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text):
+        """Yield (start, end, rank) for every word occurrence in text."""
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, rank in self._output[state]:
+                yield index + 1 - length, index + 1, rank
+
+WORD_AUTOMATON = WordAutomaton(COMMON_WORDS)
+
+def dictionary_matches(password):
+    # Lowercase one character at a time so the match indexes still point
+    # into password ('İ'.lower() is two characters long)
+    lowered = ''.join(char.lower() if len(char.lower()) == 1 else char for char in password)
+    for start, end, rank in WORD_AUTOMATON.find(lowered):
+        token = password[start:end]
+        # Capitalised or mixed-case words are only a little harder to guess
+        variations = 1 if token == token.lower() else 2 if token[0].isupper() and token[1:] == token[1:].lower() else 4
+        yield Match(start, end, rank * variations, 'dictionary')
+
+def _keyboard_guesses(token):
+    """Estimate the keyboard walks tried before this one, by length and number of turns."""
+    turns = 0
+    direction = None
+    for previous, current in zip(token, token[1:]):
+        (row_a, col_a), (row_b, col_b) = KEYBOARD_POSITIONS[previous], KEYBOARD_POSITIONS[current]
+        if (row_b - row_a, col_b - col_a) != direction:
+            turns += 1
+            direction = (row_b - row_a, col_b - col_a)
+
+    guesses = 0
+    for length in range(2, len(token) + 1):
+        for turn in range(1, min(turns, length - 1) + 1):
+            guesses += math.comb(length - 1, turn - 1) * KEYBOARD_STARTING_KEYS * KEYBOARD_AVERAGE_DEGREE ** turn
+    return guesses
+
+def keyboard_matches(password):
+    start = 0
+    for index in range(1, len(password) + 1):
+        if index < len(password) and password[index] in KEYBOARD_GRAPH.get(password[index - 1], ()):
+            continue
+        if index - start >= 3:
+            yield Match(start, index, _keyboard_guesses(password[start:index]), 'keyboard')
+        start = index
+
+def sequence_matches(password):
+    start = 0
+    for index in range(2, len(password) + 1):
+        delta = ord(password[index - 1]) - ord(password[index - 2])
+        if index < len(password) and abs(delta) == 1 and ord(password[index]) - ord(password[index - 1]) == delta:
+            continue
+        length = index - start
+        if length >= 3:
+            first = password[start]
+            base = 4 if first in 'aAzZ019' else 10 if first.isdigit() else 26
+            descending = 2 if ord(password[start + 1]) < ord(first) else 1
+            yield Match(start, index, base * length * descending, 'sequence')
+        start = index - 1
+
+REPEAT_RE = re.compile(r'(.+?)\1+')
+
+def repeat_matches(password):
+    # The regex is quadratic in the length, which MAX_MATCH_LENGTH bounds;
+    # each recursive call is on a unit at most half as long
+    for found in REPEAT_RE.finditer(password):
+        unit = found.group(1)
+        count = len(found.group(0)) // len(unit)
+        unit_guesses = estimate_guesses(unit)[0] if len(unit) > 1 else BRUTEFORCE_CARDINALITY
+        yield Match(found.start(), found.end(), unit_guesses * count, 'repeat')
+
+DATE_WITH_SEPARATOR_RE = re.compile(r'(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})')
+DIGITS_RE = re.compile(r'\d{4,8}')
+
+def _year_guesses(year):
+    if year < 100:
+        year += 2000 if year <= REFERENCE_YEAR % 100 + 5 else 1900
+    return max(abs(REFERENCE_YEAR - year), MIN_YEAR_SPACE)
+
+def _is_date(day, month, year):
+    return 1 <= day <= 31 and 1 <= month <= 12 and (year < 100 or 1900 <= year <= 2050)
+
+def _date_guesses(numbers):
+    """Return the guesses for the best date reading of three numbers, or None."""
+    best = None
+    a, b, c = numbers
+    for day, month, year in ((a, b, c), (b, a, c), (c, b, a), (b, c, a)):
+        if _is_date(day, month, year):
+            guesses = _year_guesses(year) * 365
+            best = guesses if best is None else min(best, guesses)
+    return best
+
+def date_matches(password):
+    for found in DATE_WITH_SEPARATOR_RE.finditer(password):
+        guesses = _date_guesses((int(found.group(1)), int(found.group(3)), int(found.group(4))))
+        if guesses:
+            yield Match(found.start(), found.end(), guesses * 4, 'date')
+
+    for found in DIGITS_RE.finditer(password):
+        digits = found.group(0)
+        for start in range(len(digits) - 3):
+            # Years on their own, like 1987 or 2024
+            year = int(digits[start:start + 4])
+            if 1900 <= year <= 2050:
+                yield Match(found.start() + start, found.start() + start + 4, _year_guesses(year), 'date')
+
+        # Dates without separators, like 1987 05 12 or 120587
+        if len(digits) >= 6:
+            for split_one in range(1, len(digits) - 1):
+                for split_two in range(split_one + 1, len(digits)):
+                    parts = (digits[:split_one], digits[split_one:split_two], digits[split_two:])
+                    if max(len(part) for part in parts) > 4:
+                        continue
+                    guesses = _date_guesses(tuple(int(part) for part in parts))
+                    if guesses:
+                        yield Match(found.start(), found.end(), guesses, 'date')
+
+MATCHERS = (dictionary_matches, keyboard_matches, sequence_matches, repeat_matches, date_matches)
+
+def estimate_guesses(password):
+    """Return (guesses, matches) for the easiest way to guess a password.
+
+    Every matcher runs once over the first MAX_MATCH_LENGTH characters,
+    then a dynamic program picks the sequence of matches (with brute force
+    filling the gaps) that needs the fewest guesses. Characters past that
+    are brute forced.
+    """
+    prefix = password[:MAX_MATCH_LENGTH]
+    ending_at = [[] for _ in range(len(prefix) + 1)]
+    for matcher in MATCHERS:
+        for match in matcher(prefix):
+            ending_at[match.end].append(match)
+
+    best = [1] + [None] * len(prefix)
+    chosen = [None] * (len(prefix) + 1)
+    for end in range(1, len(prefix) + 1):
+        best[end] = best[end - 1] * BRUTEFORCE_CARDINALITY
+        for match in ending_at[end]:
+            minimum = MIN_GUESSES_SINGLE if match.end - match.start == 1 else MIN_GUESSES_MULTI
+            guesses = best[match.start] * max(match.guesses, minimum)
+            if guesses < best[end]:
+                best[end] = guesses
+                chosen[end] = match
+
+    matches = []
+    end = len(prefix)
+    while end > 0:
+        if chosen[end]:
+            matches.append(chosen[end])
+            end = chosen[end].start
+        else:
+            end -= 1
+
+    guesses = best[-1]
+    if len(password) > len(prefix):
+        # An int, since a float times a huge int overflows
+        guesses = int(guesses) * BRUTEFORCE_CARDINALITY ** (len(password) - len(prefix))
+    return guesses, matches[::-1]
+
+def entropy_bits(guesses):
+    return math.log2(guesses) if guesses > 1 else 0.0
+
+def guesses_to_score(guesses):
+    """Map a guess count to a 0-4 score."""
+    for score, limit in enumerate((1e3, 1e6, 1e8, 1e10)):
+        if guesses < limit:
+            return score
+    return 4
@@ -0,0 +1,19 @@
+import unittest
+from password_checker import PasswordStrengthChecker
+
+class PatternCapTest(unittest.TestCase):
+    def setUp(self):
+        self.checker = PasswordStrengthChecker()
+
+    def test_word_with_suffix_is_not_very_strong(self):
+        for password in ['Password1!', 'Sunshine2024!', 'Dragon$99']:
+            result = self.checker.check_strength(password)
+            self.assertNotEqual(result['strength'], "Very Strong", password)
+            self.assertLessEqual(result['score'], result['pattern_score'] + 1, password)
+
+    def test_random_password_stays_very_strong(self):
+        result = self.checker.check_strength('xK9#mQ2$vL7@pR4!')
+        self.assertEqual(result['strength'], "Very Strong")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import os
+import sys
+import time
+from prime_finder import count_primes_parallel
+
+def benchmark(max_exponent=10):
+    """Time prime counting up to 10^k for every worker count and print the speedup."""
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, cores} | {2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores})
+
+    print(f"{'Limit':>8} {'Workers':>8} {'Primes':>12} {'Seconds':>10} {'Speedup':>8}")
+    print("-" * 50)
+
+    for exponent in range(7, max_exponent + 1):
+        baseline = None
+        for workers in worker_counts:
+            start_time = time.perf_counter()
+            count = count_primes_parallel(0, 10 ** exponent, workers)
+            elapsed = time.perf_counter() - start_time
+            baseline = baseline or elapsed
+            print(f"{'10^' + str(exponent):>8} {workers:>8} {count:>12} {elapsed:>10.2f} {baseline / elapsed:>7.2f}x")
+
+def main():
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    benchmark(max_exponent)
+
+if __name__ == "__main__":
+    main()
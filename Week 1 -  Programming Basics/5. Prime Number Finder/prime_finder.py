@@ -1,52 +1,522 @@
+import os
+import struct
+import sys
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from math import isqrt
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for is_prime_many
+    np = None
+
+# Number of odd values sieved at once by the segmented sieve
+SEGMENT_SIZE = 1 << 18
+
+# Number of odd values handled by one worker task in parallel mode
+PARALLEL_SEGMENT_SIZE = 1 << 22
+
+# Number of lines visualize_primes collects before writing them out
+VISUALIZE_CHUNK_LINES = 1000
+
+# On-disk prime index (see prime_index.py), built on first use and grown when
+# a range needs more, but never past INDEX_MAX_BOUND. INDEX_PATH is the
+# default location; the functions below take an index_path to use another
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'primes.idx')
+INDEX_BOUND = 10 ** 7
+INDEX_MAX_BOUND = 10 ** 9
+# A missing or too small index is only built for queries covering at least
+# this share of [0, end]; narrower windows are cheaper to sieve directly
+INDEX_BUILD_SHARE = 0.25
+
+# Small primes used for trial division before the probabilistic tests
+SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97)
+
+# Miller-Rabin bases that give a deterministic answer for every 64-bit integer
+MILLER_RABIN_BASES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+
+# The first 12 prime bases are deterministic for every n below this limit
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+MILLER_RABIN_LIMIT = 318665857834031151167461
+
+# is_prime_many looks up values below this limit in a precomputed sieve table
+BATCH_SIEVE_LIMIT = 1 << 24
+
+# Miller-Rabin bases that are deterministic for every n < 2^32
+MILLER_RABIN_BASES_32 = (2, 7, 61)
+
 def is_prime(number):
     """Check if a number is prime."""
     if number < 2:
         return False
-    
-    for i in range(2, int(number ** 0.5) + 1):
-        if number % i == 0:
+
+    # Trial division by small primes catches most composites quickly
+    for p in SMALL_PRIMES:
+        if number % p == 0:
+            return number == p
+    if number < SMALL_PRIMES[-1] ** 2:
+        return True
+
+    if number < 1 << 64:
+        return all(miller_rabin(number, base) for base in MILLER_RABIN_BASES_64)
+    if number < MILLER_RABIN_LIMIT:
+        return all(miller_rabin(number, base) for base in MILLER_RABIN_BASES)
+
+    # Baillie-PSW test for larger numbers: no counterexample is known
+    return miller_rabin(number, 2) and strong_lucas_test(number)
+
+def miller_rabin(n, base):
+    """Run one Miller-Rabin round on an odd number n > 2 with the given base."""
+    # Write n - 1 as d * 2^s with d odd
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+
+    base %= n
+    if base == 0:
+        return True
+
+    x = pow(base, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+def jacobi_symbol(a, n):
+    """Calculate the Jacobi symbol (a/n) for an odd positive n."""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+def strong_lucas_test(n):
+    """Run a strong Lucas probable prime test on an odd number n (Selfridge parameters)."""
+    # Perfect squares never yield a suitable D, so reject them up front
+    if isqrt(n) ** 2 == n:
+        return False
+
+    # Find the first D in 5, -7, 9, -11, ... with Jacobi symbol (D/n) = -1
+    d = 5
+    while True:
+        j = jacobi_symbol(d, n)
+        if j == -1:
+            break
+        if j == 0 and abs(d) != n:
             return False
-    return True
+        d = -d - 2 if d > 0 else -d + 2
+    q = (1 - d) // 4
+
+    # Write n + 1 as k * 2^s with k odd
+    k = n + 1
+    s = (k & -k).bit_length() - 1
+    k >>= s
+
+    # Compute U_k, V_k and Q^k with the binary method
+    u, v, qk = 0, 2, 1
+    for bit in bin(k)[2:]:
+        u, v = u * v % n, (v * v - 2 * qk) % n
+        qk = qk * qk % n
+        if bit == '1':
+            u, v = u + v, v + d * u
+            # Halve modulo n (n is odd, so adding n makes the value even)
+            u = (u + n if u % 2 else u) // 2 % n
+            v = (v + n if v % 2 else v) // 2 % n
+            qk = qk * q % n
+
+    if u == 0 or v == 0:
+        return True
+    for _ in range(s - 1):
+        v = (v * v - 2 * qk) % n
+        if v == 0:
+            return True
+        qk = qk * qk % n
+    return False
+
+_batch_sieve_table = None
+
+def _get_batch_sieve_table():
+    """Build (once) a NumPy boolean table of the primes below BATCH_SIEVE_LIMIT."""
+    global _batch_sieve_table
+    if _batch_sieve_table is None:
+        table = np.ones(BATCH_SIEVE_LIMIT, dtype=bool)
+        table[:2] = False
+        table[4::2] = False
+        for p in range(3, isqrt(BATCH_SIEVE_LIMIT - 1) + 1, 2):
+            if table[p]:
+                table[p * p::p] = False
+        _batch_sieve_table = table
+    return _batch_sieve_table
+
+def _mulmod_32(a, b, n):
+    """Multiply uint64 arrays modulo n for n < 2^32 (the product cannot overflow)."""
+    return a * b % n
+
+def _mulmod_small(a, c, n):
+    """Multiply a uint64 array a < n by a factor c <= 2^32 modulo n, for n < 2^62."""
+    # A float estimate of the quotient is off by at most one, and the
+    # wrapping uint64 arithmetic gives the exact remainder for that estimate
+    q = np.floor(a.astype(np.float64) * c / n.astype(np.float64)).astype(np.uint64)
+    r = (a * c - q * n).view(np.int64)
+    r = np.where(r < 0, r + n.view(np.int64), r)
+    r = np.where(r >= n.view(np.int64), r - n.view(np.int64), r)
+    return r.view(np.uint64)
+
+def _mulmod_62(a, b, n):
+    """Multiply uint64 arrays modulo n for n < 2^62, splitting b into 32-bit halves."""
+    high = _mulmod_small(_mulmod_small(a, b >> np.uint64(32), n), 1 << 32, n)
+    r = high + _mulmod_small(a, b & np.uint64(0xFFFFFFFF), n)
+    return np.where(r >= n, r - n, r)
+
+def _powmod_many(base, exponent, n, mulmod):
+    """Raise each base to its exponent modulo n with the binary method."""
+    result = np.ones_like(n)
+    exponent = exponent.copy()
+    while True:
+        odd = (exponent & np.uint64(1)).astype(bool)
+        result = np.where(odd, mulmod(result, base, n), result)
+        exponent >>= np.uint64(1)
+        if not exponent.any():
+            return result
+        base = mulmod(base, base, n)
+
+def _miller_rabin_many(n, bases, mulmod):
+    """Return a mask of the odd values in n that pass Miller-Rabin for every base."""
+    # Write n - 1 as d * 2^s with d odd
+    d = n - np.uint64(1)
+    s = np.zeros(n.shape, dtype=np.int64)
+    while True:
+        even = (d & np.uint64(1)) == 0
+        if not even.any():
+            break
+        d = np.where(even, d >> np.uint64(1), d)
+        s += even
+
+    passed_all = np.ones(n.shape, dtype=bool)
+    candidates = np.arange(n.size)
+    for base in bases:
+        # Only values that passed every earlier base are tested again
+        nn, dd, ss = n[candidates], d[candidates], s[candidates]
+        x = _powmod_many(np.uint64(base) % nn, dd, nn, mulmod)
+        passed = (x == 1) | (x == nn - np.uint64(1))
+        for r in range(1, int(ss.max(initial=0))):
+            x = mulmod(x, x, nn)
+            passed |= (r < ss) & (x == nn - np.uint64(1))
+        passed_all[candidates[~passed]] = False
+        candidates = candidates[passed]
+        if not candidates.size:
+            break
+    return passed_all
+
+def is_prime_many(numbers):
+    """Check a NumPy array of integers for primality and return a boolean mask.
+
+    Values below BATCH_SIEVE_LIMIT are looked up in a sieve table, larger
+    ones go through small-prime trial division and vectorized Miller-Rabin.
+    Values of 2^62 and above fall back to is_prime one by one.
+    """
+    if np is None:
+        raise ImportError("is_prime_many requires NumPy (pip install numpy).")
+    numbers = np.asarray(numbers)
+    if not np.issubdtype(numbers.dtype, np.integer):
+        raise TypeError("is_prime_many expects an array of integers.")
+
+    shape = numbers.shape
+    numbers = numbers.ravel()
+    result = np.zeros(numbers.size, dtype=bool)
+
+    # Negative numbers stay False; everything else is handled as uint64
+    if np.issubdtype(numbers.dtype, np.signedinteger):
+        valid = numbers >= 0
+    else:
+        valid = np.ones(numbers.size, dtype=bool)
+    values = numbers.astype(np.uint64)
+
+    # Fast path: sieve table lookup for small values
+    small = valid & (values < BATCH_SIEVE_LIMIT)
+    result[small] = _get_batch_sieve_table()[values[small]]
+
+    # Trial division by small primes removes most of the remaining composites
+    large = np.flatnonzero(valid & ~small)
+    for p in SMALL_PRIMES:
+        large = large[values[large] % np.uint64(p) != 0]
+
+    # Vectorized Miller-Rabin with overflow-free multiplication for each size class
+    below_32 = values[large] < 1 << 32
+    below_62 = values[large] < 1 << 62
+    for indexes, bases, mulmod in (
+        (large[below_32], MILLER_RABIN_BASES_32, _mulmod_32),
+        (large[~below_32 & below_62], MILLER_RABIN_BASES_64, _mulmod_62),
+    ):
+        if indexes.size:
+            result[indexes] = _miller_rabin_many(values[indexes], bases, mulmod)
+
+    # Numbers too large for the float-assisted multiplication
+    for i in large[~below_62]:
+        result[i] = is_prime(int(values[i]))
+
+    return result.reshape(shape)
 
 def sieve_of_eratosthenes(start, end):
     """Generate prime numbers using the Sieve of Eratosthenes algorithm."""
-    # Create a boolean array "is_prime[0..end]" and initialize
-    # all entries it as true
-    sieve = [True] * (end + 1)
-    sieve[0] = sieve[1] = False
+    if end < 2:
+        return []
+
+    # Only odd numbers are stored: index i stands for the number 2*i + 1
+    size = (end + 1) // 2
+    sieve = bytearray([1]) * size
+    sieve[0] = 0  # 1 is not prime
 
-    for i in range(2, int(end ** 0.5) + 1):
+    for i in range(1, (isqrt(end) - 1) // 2 + 1):
         if sieve[i]:
-            # Update all multiples of i starting from i*i
-            for j in range(i * i, end + 1, i):
-                sieve[j] = False
+            # Cross off odd multiples of p starting from p*p
+            p = 2 * i + 1
+            first = p * p // 2
+            sieve[first::p] = bytes(len(range(first, size, p)))
 
     # Create the list of prime numbers within the range
-    return [i for i in range(max(2, start), end + 1) if sieve[i]]
+    primes = [2] if start <= 2 else []
+    first = max(start, 3) // 2
+    primes.extend(2 * i + 1 for i in compress(range(first, size), sieve[first:]))
+    return primes
+
+def sieve_segment(low, high, base_primes):
+    """Sieve the odd numbers in [low, high] (low must be odd) with the given odd base primes.
+
+    Returns a bytearray where index i is 1 if low + 2*i is prime.
+    """
+    size = (high - low) // 2 + 1
+    segment = bytearray([1]) * size
+
+    for p in base_primes:
+        if p * p > high:
+            break
+        # First odd multiple of p inside the segment, but never p itself
+        first = max(p * p, (low + p - 1) // p * p)
+        if first % 2 == 0:
+            first += p
+        index = (first - low) // 2
+        if index < size:
+            segment[index::p] = bytes(len(range(index, size, p)))
+
+    if low == 1:
+        segment[0] = 0  # 1 is not prime
+    return segment
+
+def segmented_sieve(start, end=None, segment_size=SEGMENT_SIZE):
+    """Generate prime numbers in [start, end] one fixed-size segment at a time.
+
+    When end is None the generator never stops. Memory use depends on the
+    base primes up to sqrt(end) and the segment size, not on end itself.
+    """
+    if end is not None and (end < 2 or start > end):
+        return
+    if start <= 2:
+        yield 2
+
+    base_primes = []
+    base_limit = 2
+    low = max(start, 3) | 1  # first odd number in the range
+
+    while end is None or low <= end:
+        high = low + 2 * (segment_size - 1)
+        if end is not None:
+            high = min(high, end)
+
+        # Extend the base primes as the segments move up (doubling the limit
+        # so an unbounded run only re-sieves a logarithmic number of times)
+        if isqrt(high) > base_limit:
+            new_limit = max(isqrt(high), 2 * base_limit)
+            if end is not None:
+                new_limit = min(new_limit, isqrt(end))
+            base_primes.extend(sieve_of_eratosthenes(base_limit + 1, new_limit))
+            base_limit = new_limit
+
+        segment = sieve_segment(low, high, base_primes)
+        for i in compress(range(len(segment)), segment):
+            yield low + 2 * i
+        low += 2 * len(segment)
+
+# Base primes shared by every task of a worker process (set by _init_worker)
+_worker_base_primes = None
+
+def _init_worker(base_primes):
+    global _worker_base_primes
+    _worker_base_primes = base_primes
+
+def _sieve_task(low, high, count_only):
+    """Sieve the odd numbers in [low, high] inside a worker process.
+
+    Returns the number of primes, or a compact array of them.
+    """
+    result = 0 if count_only else array('Q')
+    while low <= high:
+        segment_high = min(low + 2 * (SEGMENT_SIZE - 1), high)
+        segment = sieve_segment(low, segment_high, _worker_base_primes)
+        if count_only:
+            result += segment.count(1)
+        else:
+            result.extend(low + 2 * i for i in compress(range(len(segment)), segment))
+        low = segment_high + 2
+    return result
+
+def parallel_sieve(start, end, workers=None, count_only=False, segment_size=PARALLEL_SEGMENT_SIZE):
+    """Sieve [start, end] across a process pool and yield the results segment by segment.
+
+    Each result is an array of primes (or a count when count_only is True),
+    and results are yielded in the order of the range. Numbers must fit
+    in 64 bits.
+    """
+    if end < 2 or start > end:
+        return
+    if end >= 1 << 64:
+        raise ValueError("Parallel mode only supports numbers below 2^64.")
+    workers = workers or os.cpu_count() or 1
+
+    if start <= 2:
+        yield 1 if count_only else array('Q', [2])
+
+    base_primes = array('Q', sieve_of_eratosthenes(3, isqrt(end)))
+    low = max(start, 3) | 1
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(base_primes,)) as executor:
+        # Keep a bounded number of tasks in flight so results stream back in order
+        pending = deque()
+        while low <= end:
+            high = min(low + 2 * (segment_size - 1), end)
+            pending.append(executor.submit(_sieve_task, low, high, count_only))
+            low = high + 2
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def count_primes_parallel(start, end, workers=None):
+    """Count the prime numbers in [start, end] using a process pool."""
+    return sum(parallel_sieve(start, end, workers, count_only=True))
+
+_prime_index = None
+
+def load_prime_index(end, build=True, index_path=None):
+    """Return the prime index at index_path (default INDEX_PATH) if it covers numbers up to end.
+
+    Otherwise a larger index is built when build is True (a corrupt or
+    truncated file is rebuilt too), and None is returned when it is False.
+    """
+    global _prime_index
+    if end > INDEX_MAX_BOUND:
+        return None
+    from prime_index import PrimeIndex
+
+    index_path = index_path or INDEX_PATH
+    if _prime_index is not None and _prime_index.path != index_path:
+        _prime_index.close()
+        _prime_index = None
+    if _prime_index is None and os.path.exists(index_path):
+        try:
+            _prime_index = PrimeIndex(index_path)
+        except (ValueError, struct.error, OSError):
+            _prime_index = None
 
-def get_primes_in_range(start, end):
-    """Generate a list of prime numbers within a given range."""
-    # Use Sieve of Eratosthenes for ranges larger than 1000
+    if _prime_index is not None and _prime_index.bound >= end:
+        return _prime_index
+    if not build:
+        return None
+
+    bound = max(INDEX_BOUND, min(2 * end, INDEX_MAX_BOUND))
+    if _prime_index is not None:
+        _prime_index.close()
+        _prime_index = None
+    try:
+        PrimeIndex.build(index_path, bound)
+        _prime_index = PrimeIndex(index_path)
+    except OSError:
+        # For example a read-only directory; the caller sieves instead
+        return None
+    return _prime_index
+
+def _index_for_range(start, end, workers=1, index_path=None):
+    """Return the prime index for [start, end] when it is worth using.
+
+    An index that already covers end is always used. A new one is only
+    built by single-process queries that cover a large share of [0, end],
+    since building sieves everything up to twice end.
+    """
+    build = workers == 1 and end - start >= INDEX_BUILD_SHARE * end
+    return load_prime_index(end, build, index_path)
+
+def iter_primes(start=2, end=None, index_path=None):
+    """Lazily generate prime numbers from start up to end, or forever when end is None."""
+    if end is not None:
+        index = _index_for_range(start, end, index_path=index_path)
+        if index is not None:
+            return index.iter_primes(start, end)
+    return segmented_sieve(start, end)
+
+def get_primes_in_range(start, end, workers=1, index_path=None):
+    """Generate a list of prime numbers within a given range.
+
+    Pass workers > 1 (or None for all cores) to sieve large ranges in parallel,
+    and index_path to keep the prime index somewhere other than INDEX_PATH.
+    """
+    # Answer from the prime index when it covers the range or is worth building
+    index = _index_for_range(start, end, workers, index_path)
+    if index is not None:
+        return index.primes_in_range(start, end)
+
+    # Use the segmented sieve for ranges larger than 1000
     if end - start > 1000:
-        return sieve_of_eratosthenes(start, end)
+        if workers != 1:
+            primes = []
+            for chunk in parallel_sieve(start, end, workers):
+                primes.extend(chunk)
+            return primes
+        return list(segmented_sieve(start, end))
     return [num for num in range(max(2, start), end + 1) if is_prime(num)]
 
 def visualize_primes(start, end):
     """Create a simple visualization of prime numbers in a range."""
-    primes = get_primes_in_range(start, end)
-    
     print(f"\nPrime numbers between {start} and {end}:")
     print("-" * 50)
-    
+
+    # Walk the range and the prime stream together, writing output in chunks
+    primes = iter_primes(start, end)
+    next_prime = next(primes, None)
+    prime_count = 0
+    row = []
+    chunk = []
+
     for number in range(start, end + 1):
-        if number in primes:
-            print("🟢", end=" ")  # Green circle for prime numbers
+        if number == next_prime:
+            row.append("🟢 ")  # Green circle for prime numbers
+            prime_count += 1
+            next_prime = next(primes, None)
         else:
-            print("⚪", end=" ")  # White circle for non-prime numbers
-        if (number - start + 1) % 10 == 0:  # New line every 10 numbers
-            print()
+            row.append("⚪ ")  # White circle for non-prime numbers
+        if len(row) == 10:  # New line every 10 numbers
+            row.append("\n")
+            chunk.append("".join(row))
+            row = []
+            if len(chunk) == VISUALIZE_CHUNK_LINES:
+                sys.stdout.write("".join(chunk))
+                chunk = []
+
+    chunk.extend(row)
+    sys.stdout.write("".join(chunk))
     print("\n")
-    print(f"Found {len(primes)} prime numbers in this range.")
+    print(f"Found {prime_count} prime numbers in this range.")
 
 def main():
     while True:
@@ -0,0 +1,174 @@
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left
+from math import isqrt
+from prime_finder import SEGMENT_SIZE, sieve_of_eratosthenes, sieve_segment
+
+# File layout: header, odd-only prime bitset, block popcount table.
+# Bit i of the bitset is set when 2*i + 1 is prime. Entry j of the table
+# holds the number of set bits before block j (plus the total at the end).
+MAGIC = b'PRIMEIDX'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQQQ')
+HEADER_SIZE = 64
+BLOCK_BYTES = 64
+BLOCK_BITS = BLOCK_BYTES * 8
+
+# Turns a sieve segment of 0/1 bytes into a string of '0'/'1' digits
+_TO_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
+# Bit positions set in each possible byte value
+_BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+def _popcount(data):
+    return bin(int.from_bytes(data, 'little')).count('1')
+
+class PrimeIndex:
+    """Memory-mapped, read-only index of the primes up to a fixed bound."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < HEADER_SIZE:
+            self._mm.close()
+            raise ValueError(f"{path} is not a valid prime index file.")
+        magic, version, block_bits, bound, bitset_size, block_count = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION or block_bits != BLOCK_BITS:
+            self._mm.close()
+            raise ValueError(f"{path} is not a valid prime index file.")
+
+        # A truncated file would otherwise fail later, on the first lookup
+        if len(self._mm) < HEADER_SIZE + bitset_size + 8 * (block_count + 1):
+            self._mm.close()
+            raise ValueError(f"{path} is truncated.")
+
+        self.path = path
+        self.bound = bound
+        self._bitset = memoryview(self._mm)[HEADER_SIZE:HEADER_SIZE + bitset_size]
+        table_start = HEADER_SIZE + bitset_size
+        self._blocks = memoryview(self._mm)[table_start:table_start + 8 * (block_count + 1)].cast('Q')
+
+    @classmethod
+    def build(cls, path, bound):
+        """Sieve the primes up to bound and write them to an index file at path.
+
+        The file is written under a temporary name unique to this call and
+        then renamed, so concurrent builders never write to the same file.
+        """
+        bit_count = (bound + 1) // 2
+        block_count = -(-bit_count // BLOCK_BITS)
+        bitset_size = block_count * BLOCK_BYTES
+        # SEGMENT_SIZE is a multiple of BLOCK_BITS, so segments never split a block
+        base_primes = sieve_of_eratosthenes(3, isqrt(bound))
+        blocks = array('Q', [0])
+
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile(dir=directory, prefix=os.path.basename(path) + '.',
+                                         suffix='.tmp', delete=False) as f:
+            temp_path = f.name
+            try:
+                f.write(HEADER.pack(MAGIC, VERSION, BLOCK_BITS, bound, bitset_size, block_count).ljust(HEADER_SIZE, b'\0'))
+
+                for first_bit in range(0, bit_count, SEGMENT_SIZE):
+                    low = 2 * first_bit + 1
+                    high = min(low + 2 * (SEGMENT_SIZE - 1), 2 * bit_count - 1)
+                    segment = sieve_segment(low, high, base_primes)
+
+                    # Pack one byte per odd number into one bit per odd number
+                    bits = int(segment.translate(_TO_DIGITS)[::-1], 2)
+                    f.write(bits.to_bytes(-(-len(segment) // 8), 'little'))
+
+                    for offset in range(0, len(segment), BLOCK_BITS):
+                        blocks.append(blocks[-1] + segment.count(1, offset, offset + BLOCK_BITS))
+
+                # Pad the last block, then append the popcount table
+                f.write(bytes(HEADER_SIZE + bitset_size - f.tell()))
+                blocks.tofile(f)
+            except BaseException:
+                f.close()
+                os.remove(temp_path)
+                raise
+
+        # Temporary files are created private; the index is readable by all
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+
+    def close(self):
+        self._bitset.release()
+        self._blocks.release()
+        self._mm.close()
+
+    def _check(self, number):
+        if number > self.bound:
+            raise ValueError(f"{number} is beyond the index bound of {self.bound}.")
+
+    def _bits_below(self, bit):
+        """Count the set bits with an index below bit."""
+        block, offset = divmod(bit, BLOCK_BITS)
+        byte_start = block * BLOCK_BYTES
+        byte_end = byte_start + offset // 8
+        count = self._blocks[block] + _popcount(self._bitset[byte_start:byte_end])
+        if offset % 8:
+            count += bin(self._bitset[byte_end] & ((1 << offset % 8) - 1)).count('1')
+        return count
+
+    def is_prime(self, number):
+        """Check if a number up to the bound is prime."""
+        self._check(number)
+        if number < 3 or number % 2 == 0:
+            return number == 2
+        bit = number // 2
+        return bool(self._bitset[bit // 8] >> bit % 8 & 1)
+
+    def prime_pi(self, number):
+        """Count the primes up to and including number."""
+        self._check(number)
+        if number < 2:
+            return 0
+        return 1 + self._bits_below((number + 1) // 2)
+
+    def count_primes(self, start, end):
+        """Count the primes in [start, end]."""
+        if start > end:
+            return 0
+        return self.prime_pi(end) - self.prime_pi(start - 1)
+
+    def nth_prime(self, k):
+        """Return the k-th prime (nth_prime(1) == 2)."""
+        if k < 1 or k > self.prime_pi(self.bound):
+            raise ValueError(f"The index only holds {self.prime_pi(self.bound)} primes.")
+        if k == 1:
+            return 2
+
+        # Find the block holding the (k - 1)-th odd prime, then scan its bytes
+        remaining = k - 1
+        block = bisect_left(self._blocks, remaining) - 1
+        remaining -= self._blocks[block]
+        byte_index = block * BLOCK_BYTES
+        while True:
+            bits = _BYTE_BITS[self._bitset[byte_index]]
+            if len(bits) >= remaining:
+                return 2 * (8 * byte_index + bits[remaining - 1]) + 1
+            remaining -= len(bits)
+            byte_index += 1
+
+    def iter_primes(self, start, end):
+        """Generate the primes in [start, end] in increasing order."""
+        self._check(end)
+        if start <= 2 <= end:
+            yield 2
+        first_bit = max(start, 3) // 2
+        last_bit = (end - 1) // 2
+        for byte_index in range(first_bit // 8, last_bit // 8 + 1):
+            for bit in _BYTE_BITS[self._bitset[byte_index]]:
+                bit += 8 * byte_index
+                if first_bit <= bit <= last_bit:
+                    yield 2 * bit + 1
+
+    def primes_in_range(self, start, end):
+        """Return a list of the primes in [start, end]."""
+        return list(self.iter_primes(start, end))
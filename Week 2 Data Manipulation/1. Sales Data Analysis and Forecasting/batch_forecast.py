@@ -0,0 +1,126 @@
+import argparse
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.holtwinters import ExponentialSmoothing
+from sales_analysis import load_and_clean_data
+
+SEASONAL_PERIODS = 12
+
+# Series shorter than this use Holt's linear trend instead of Holt-Winters,
+# and series shorter than HOLT_MIN_LENGTH repeat their last value
+HOLT_WINTERS_MIN_LENGTH = 2 * SEASONAL_PERIODS
+HOLT_MIN_LENGTH = 4
+
+SEGMENT_COLUMNS = ['product', 'region']
+
+def segment_series(df, segment_columns=SEGMENT_COLUMNS):
+    """Split df into monthly total_amount series, one per segment
+
+    Returns {segment key tuple: Series indexed by month}. Each series starts at the
+    segment's first sale and months without sales count as 0.
+    """
+    months = df['date'].dt.to_period('M')
+    table = df.groupby(segment_columns + [months], observed=True)['total_amount'].sum().unstack(fill_value=0)
+    table = table.reindex(columns=pd.period_range(months.min(), months.max(), freq='M'), fill_value=0)
+
+    series = {}
+    for key, row in zip(table.index, table.to_numpy()):
+        first = np.flatnonzero(row)
+        if first.size:
+            key = key if isinstance(key, tuple) else (key,)
+            series[key] = pd.Series(row[first[0]:], index=table.columns[first[0]:])
+    return series
+
+def fit_series(values, periods):
+    """Forecast one series with the most detailed model its length allows
+
+    Returns (model name, forecast values). A model that fails to fit falls
+    back to the next simpler one.
+    """
+    models = []
+    if len(values) >= HOLT_WINTERS_MIN_LENGTH:
+        models.append(('holt_winters', dict(trend='add', seasonal='add', seasonal_periods=SEASONAL_PERIODS)))
+    if len(values) >= HOLT_MIN_LENGTH:
+        models.append(('holt', dict(trend='add')))
+
+    for name, options in models:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                forecast = ExponentialSmoothing(values, **options).fit().forecast(periods)
+            if np.all(np.isfinite(forecast)):
+                return name, forecast
+        except (ValueError, np.linalg.LinAlgError):
+            pass
+    return 'naive', np.full(periods, values[-1])
+
+def forecast_chunk(tasks):
+    """Fit a list of (key, values, periods) tasks and return one result per task"""
+    results = []
+    for key, values, periods in tasks:
+        start = time.perf_counter()
+        try:
+            model, forecast = fit_series(values, periods)
+            error = None
+        except Exception as e:
+            model, forecast, error = None, np.full(periods, np.nan), str(e)
+        results.append((key, model, forecast, time.perf_counter() - start, error))
+    return results
+
+def forecast_segments(df, periods=6, workers=None, chunksize=None, segment_columns=SEGMENT_COLUMNS):
+    """Forecast every segment (by default product x region) on a process pool
+
+    Series are sent to the workers in chunks of tasks. Returns two frames:
+    forecasts, with one row per segment and future month, and a report with
+    the model, number of months, fit seconds and error of every series.
+    """
+    series = segment_series(df, segment_columns)
+    tasks = [(key, values.to_numpy(dtype=float), periods) for key, values in series.items()]
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = chunksize or max(1, len(tasks) // (4 * workers))
+    chunks = [tasks[i:i + chunksize] for i in range(0, len(tasks), chunksize)]
+    if workers == 1:
+        results = [result for chunk in chunks for result in forecast_chunk(chunk)]
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            results = [result for chunk_results in executor.map(forecast_chunk, chunks) for result in chunk_results]
+
+    forecast_rows = []
+    report_rows = []
+    for key, model, forecast, seconds, error in results:
+        future = pd.period_range(series[key].index[-1] + 1, periods=periods, freq='M')
+        for month, value in zip(future.to_timestamp(), forecast):
+            forecast_rows.append(key + (month, value, model))
+        report_rows.append(key + (model, len(series[key]), seconds, error))
+
+    forecasts = pd.DataFrame(forecast_rows, columns=segment_columns + ['date', 'forecast', 'model'])
+    report = pd.DataFrame(report_rows, columns=segment_columns + ['model', 'months', 'fit_seconds', 'error'])
+    return forecasts, report
+
+def print_report(report):
+    print(f"Series: {len(report)}  Failed: {report['error'].notna().sum()}  "
+          f"Fit time: {report['fit_seconds'].sum():.2f}s total, {report['fit_seconds'].max():.3f}s slowest")
+    for model, count in report['model'].value_counts().items():
+        print(f"  {model:<14} {count:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Forecast monthly sales for every product and region.")
+    parser.add_argument('input', nargs='?', default='sales_data.csv')
+    parser.add_argument('-p', '--periods', type=int, default=6, help="months to forecast")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="number of processes (default: all cores)")
+    parser.add_argument('-o', '--output', default='segment_forecasts.csv')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    forecasts, report = forecast_segments(load_and_clean_data(args.input), args.periods, args.workers)
+    forecasts.to_csv(args.output, index=False)
+    print_report(report)
+    print(f"Wrote {len(forecasts)} forecasts to {args.output} in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
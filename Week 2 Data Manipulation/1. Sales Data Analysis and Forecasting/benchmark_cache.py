@@ -0,0 +1,72 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from data_cache import DataCache
+from sales_analysis import load_and_clean_data
+
+try:
+    import resource
+except ImportError:  # not available on Windows; memory is then not reported
+    resource = None
+
+def make_benchmark_file(path, rows, source='sales_data.csv'):
+    """Write a CSV with the given number of rows by repeating the source data"""
+    sample = pd.read_csv(source)
+    repeats = -(-rows // len(sample))
+    pd.concat([sample] * repeats, ignore_index=True).head(rows).to_csv(path, index=False)
+
+def timed(func, repeat=1):
+    """Best wall time of func() over repeat runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def peak_rss():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak * (1 if sys.platform == 'darwin' else 1024)
+
+def load_memory(path, use_cache):
+    """Bytes the peak RSS grows by while loading path once"""
+    before = peak_rss()
+    df = load_and_clean_data(path, use_cache=use_cache)
+    return peak_rss() - before
+
+def measured_memory(path, use_cache):
+    """load_memory() in a fresh process, so earlier loads do not hide it; None without resource"""
+    if resource is None:
+        return None
+    with ProcessPoolExecutor(1) as executor:
+        return executor.submit(load_memory, path, use_cache).result()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare parsing the CSV with cold and warm cache loads.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument('--repeat', type=int, default=3, help="runs per warm measurement")
+    args = parser.parse_args()
+
+    print(f"{'Rows':>10} {'CSV MB':>8} {'Parse s':>8} {'Cold s':>8} {'Warm s':>8} {'Speedup':>8} {'Parse MB':>9} {'Warm MB':>8}")
+    print("-" * 74)
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            path = os.path.join(directory, f'sales_{rows}.csv')
+            make_benchmark_file(path, rows)
+
+            parse = timed(lambda: load_and_clean_data(path, use_cache=False))
+            DataCache().clear(path)
+            cold = timed(lambda: load_and_clean_data(path))
+            warm = timed(lambda: load_and_clean_data(path), args.repeat)
+            size_mb = os.path.getsize(path) / 1e6
+            memory = [measured_memory(path, use_cache) for use_cache in (False, True)]
+            memory_text = ' '.join(f"{value / 1e6:>8.0f}" if value is not None else f"{'n/a':>8}" for value in memory)
+            print(f"{rows:>10} {size_mb:>8.1f} {parse:>8.3f} {cold:>8.3f} {warm:>8.3f} {parse / warm:>7.1f}x  {memory_text}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+
+try:
+    from pyarrow import feather
+except ImportError:  # pyarrow is optional; without it nothing is cached
+    feather = None
+
+class DataCache:
+    """
+    Feather copies of cleaned data frames. The manifest maps each source
+    file's absolute path to its size, modification time and content hash.
+    Cache files go to a .sales_cache folder next to the source file unless
+    a cache_dir is given.
+    """
+    dir_name = '.sales_cache'
+    block_size = 1 << 20
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+
+    @property
+    def enabled(self):
+        return feather is not None
+
+    def directory_for(self, file_path):
+        return self.cache_dir or os.path.join(os.path.dirname(os.path.abspath(file_path)), self.dir_name)
+
+    def _manifest_path(self, file_path):
+        return os.path.join(self.directory_for(file_path), 'manifest.json')
+
+    def _read_manifest(self, file_path):
+        try:
+            with open(self._manifest_path(file_path)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, file_path, manifest):
+        manifest_path = self._manifest_path(file_path)
+        temp_path = manifest_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, manifest_path)
+
+    def content_hash(self, file_path):
+        """
+        Hash the file content with blake2b
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(self.block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def fingerprint(self, file_path):
+        """
+        Return the manifest entry (size, mtime_ns, hash) for a source file;
+        the hash is only recomputed when size or mtime changed
+        """
+        stat = os.stat(file_path)
+        entry = self._read_manifest(file_path).get(os.path.abspath(file_path))
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': self.content_hash(file_path)}
+
+    def _prefix(self, file_path):
+        """
+        Start of the cache file names of a source; the path hash keeps files
+        with the same name in different folders apart
+        """
+        absolute = os.path.abspath(file_path)
+        name = os.path.splitext(os.path.basename(absolute))[0]
+        path_key = hashlib.blake2b(absolute.encode('utf-8'), digest_size=4).hexdigest()
+        return f"{name}-{path_key}-"
+
+    def path_for(self, file_path, tag, entry):
+        return os.path.join(self.directory_for(file_path), f"{self._prefix(file_path)}{tag}-{entry['hash']}.feather")
+
+    def load(self, file_path, build, tag, categories=()):
+        """
+        Return the cached frame for file_path, or build(file_path) and cache it.
+        Categorical columns and datetime64 dates are kept as they are. The
+        file is written as a single record batch, so on warm loads the numeric
+        and date columns are read-only views of the memory-mapped file rather
+        than copies (pandas copies a column when it is modified).
+        """
+        if not self.enabled:
+            return build(file_path)
+
+        entry = self.fingerprint(file_path)
+        cache_path = self.path_for(file_path, tag, entry)
+        if os.path.exists(cache_path):
+            df = feather.read_table(cache_path, memory_map=True).to_pandas(split_blocks=True, self_destruct=True)
+        else:
+            df = build(file_path)
+            for column in categories:
+                if column in df.columns:
+                    df[column] = df[column].astype('category')
+            df = df.reset_index(drop=True)
+
+            os.makedirs(self.directory_for(file_path), exist_ok=True)
+            temp_path = cache_path + '.tmp'
+            feather.write_feather(df, temp_path, compression='uncompressed', chunksize=max(len(df), 1))
+            os.replace(temp_path, cache_path)
+            self._remove(file_path, f"{self._prefix(file_path)}{tag}-", keep=cache_path)
+
+        manifest = self._read_manifest(file_path)
+        key = os.path.abspath(file_path)
+        if manifest.get(key) != entry:
+            manifest[key] = entry
+            self._write_manifest(file_path, manifest)
+        return df
+
+    def clear(self, file_path):
+        """
+        Delete every cached frame of a source file
+        """
+        self._remove(file_path, self._prefix(file_path))
+
+    def _remove(self, file_path, prefix, keep=None):
+        """
+        Delete the cache files starting with prefix, except keep
+        """
+        cache_dir = self.directory_for(file_path)
+        if not os.path.isdir(cache_dir):
+            return
+        for name in os.listdir(cache_dir):
+            path = os.path.join(cache_dir, name)
+            if name.startswith(prefix) and name.endswith('.feather') and path != keep:
+                os.remove(path)
@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import time
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.holtwinters import ExponentialSmoothing
+from batch_forecast import HOLT_WINTERS_MIN_LENGTH, SEASONAL_PERIODS, SEGMENT_COLUMNS, fit_series, segment_series
+from sales_analysis import load_and_clean_data
+
+STATE_PATH = 'forecast_state.json'
+
+# A series is refit after this many updates, or earlier (after at least
+# DRIFT_MIN_UPDATES updates) when its recent one-step error grows past
+# DRIFT_THRESHOLD times its in-sample error
+REFIT_EVERY = 12
+DRIFT_THRESHOLD = 2.0
+DRIFT_MIN_UPDATES = 3
+
+# Weight of the newest error in the moving average of absolute errors
+DRIFT_SMOOTHING = 0.3
+
+class HoltWintersState:
+    """Additive Holt-Winters parameters and state after the last observation
+
+    season[0] is the seasonal component of the next month. update() applies
+    the same recursion as statsmodels, so updating month by month gives the
+    same forecast as fitting the whole series with these parameters.
+    """
+
+    def __init__(self, alpha, beta, gamma, level, trend, season, last_period,
+                 fit_error, updates_since_fit=0, recent_error=None):
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.level = level
+        self.trend = trend
+        self.season = deque(season, maxlen=len(season))
+        self.last_period = pd.Period(last_period, freq='M')
+        self.fit_error = fit_error
+        self.updates_since_fit = updates_since_fit
+        self.recent_error = recent_error
+
+    @classmethod
+    def fit(cls, values, last_period, seasonal_periods=SEASONAL_PERIODS):
+        """Fit a model like forecast_sales() and keep its final state"""
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            results = ExponentialSmoothing(values, seasonal_periods=seasonal_periods,
+                                           trend='add', seasonal='add').fit()
+        params = results.params
+        return cls(
+            float(params['smoothing_level']),
+            float(params['smoothing_trend']),
+            float(params['smoothing_seasonal']),
+            float(results.level[-1]),
+            float(results.trend[-1]),
+            [float(s) for s in results.season[-seasonal_periods:]],
+            last_period,
+            float(np.mean(np.abs(results.resid))),
+        )
+
+    def update(self, value):
+        """Add the next month's value in O(1) and return the one-step forecast error"""
+        seasonal = self.season[0]
+        error = value - (self.level + self.trend + seasonal)
+
+        level = self.alpha * (value - seasonal) + (1 - self.alpha) * (self.level + self.trend)
+        self.season.append(self.gamma * (value - self.level - self.trend) + (1 - self.gamma) * seasonal)
+        self.trend = self.beta * (level - self.level) + (1 - self.beta) * self.trend
+        self.level = level
+
+        if self.recent_error is None:
+            self.recent_error = abs(error)
+        else:
+            self.recent_error = DRIFT_SMOOTHING * abs(error) + (1 - DRIFT_SMOOTHING) * self.recent_error
+        self.updates_since_fit += 1
+        self.last_period += 1
+        return error
+
+    def forecast(self, periods):
+        steps = np.arange(1, periods + 1)
+        season = np.array(self.season)
+        return self.level + steps * self.trend + season[(steps - 1) % len(season)]
+
+    def needs_refit(self):
+        if self.updates_since_fit >= REFIT_EVERY:
+            return True
+        return self.updates_since_fit >= DRIFT_MIN_UPDATES and self.recent_error > DRIFT_THRESHOLD * self.fit_error
+
+    def to_dict(self):
+        return {
+            'alpha': self.alpha, 'beta': self.beta, 'gamma': self.gamma,
+            'level': self.level, 'trend': self.trend, 'season': list(self.season),
+            'last_period': str(self.last_period), 'fit_error': self.fit_error,
+            'updates_since_fit': self.updates_since_fit, 'recent_error': self.recent_error,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+def load_states(path=STATE_PATH):
+    """Read {segment key tuple: HoltWintersState} from a JSON file"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        records = json.load(f)['series']
+    return {tuple(record.pop('key')): HoltWintersState.from_dict(record) for record in records}
+
+def save_states(states, path=STATE_PATH):
+    records = [dict(state.to_dict(), key=list(key)) for key, state in states.items()]
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump({'seasonal_periods': SEASONAL_PERIODS, 'series': records}, f)
+    os.replace(temp_path, path)
+
+def fit_chunk(tasks):
+    """Fit a list of (key, values, last_period) tasks; failed fits give None"""
+    results = []
+    for key, values, last_period in tasks:
+        try:
+            state = HoltWintersState.fit(values, last_period)
+            if not np.all(np.isfinite(state.forecast(1))):
+                state = None
+        except (ValueError, np.linalg.LinAlgError):
+            state = None
+        results.append((key, state))
+    return results
+
+def refit_states(tasks, workers=None):
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) < 2:
+        return fit_chunk(tasks)
+    chunksize = max(1, len(tasks) // (4 * workers))
+    chunks = [tasks[i:i + chunksize] for i in range(0, len(tasks), chunksize)]
+    with ProcessPoolExecutor(workers) as executor:
+        return [result for chunk_results in executor.map(fit_chunk, chunks) for result in chunk_results]
+
+def complete_months(series, as_of=None):
+    """Cut every series back to the months that ended before as_of (default: now)
+
+    A month still in progress would be folded into the saved state with a
+    partial total and never corrected, so it is left out until it ends.
+    Series without a complete month are dropped.
+    """
+    current = pd.Timestamp.now() if as_of is None else pd.Timestamp(as_of)
+    current = current.to_period('M')
+    trimmed = {key: values[values.index < current] for key, values in series.items()}
+    return {key: values for key, values in trimmed.items() if len(values)}
+
+def update_forecasts(df, periods=6, state_path=STATE_PATH, workers=None, segment_columns=SEGMENT_COLUMNS, as_of=None):
+    """Bring every segment's saved state up to date and forecast
+
+    Only months that ended before as_of (default: now) are used, see
+    complete_months(). Months after a state's last_period are applied with
+    update(). Series without a state, or whose state is due for a refit,
+    are refit on a process pool. Series shorter than two seasons are
+    forecast with batch_forecast.fit_series and get no state. Returns the
+    tidy forecast frame and a dict counting updated, unchanged (no new
+    month), refit, short and failed series.
+    """
+    series = complete_months(segment_series(df, segment_columns), as_of)
+    states = load_states(state_path)
+    counts = {'updated': 0, 'unchanged': 0, 'refit': 0, 'short': 0, 'failed': 0}
+
+    to_refit = []
+    for key, values in series.items():
+        if len(values) < HOLT_WINTERS_MIN_LENGTH:
+            states.pop(key, None)
+            continue
+        state = states.get(key)
+        if state is not None and state.last_period <= values.index[-1]:
+            new_values = values[values.index > state.last_period]
+            for value in new_values:
+                state.update(float(value))
+            if not state.needs_refit():
+                counts['updated' if len(new_values) else 'unchanged'] += 1
+                continue
+        to_refit.append((key, values.to_numpy(dtype=float), str(values.index[-1])))
+
+    for key, state in refit_states(to_refit, workers):
+        if state is None:
+            states.pop(key, None)
+        else:
+            states[key] = state
+            counts['refit'] += 1
+
+    rows = []
+    for key, values in series.items():
+        state = states.get(key)
+        if state is not None:
+            model, forecast = 'holt_winters', state.forecast(periods)
+        else:
+            model, forecast = fit_series(values.to_numpy(dtype=float), periods)
+            counts['short' if len(values) < HOLT_WINTERS_MIN_LENGTH else 'failed'] += 1
+        future = pd.period_range(values.index[-1] + 1, periods=periods, freq='M').to_timestamp()
+        rows.extend(key + (month, value, model) for month, value in zip(future, forecast))
+
+    save_states({key: state for key, state in states.items() if key in series}, state_path)
+    forecasts = pd.DataFrame(rows, columns=segment_columns + ['date', 'forecast', 'model'])
+    return forecasts, counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Update saved Holt-Winters states with new data and forecast every product and region.")
+    parser.add_argument('input', nargs='?', default='sales_data.csv')
+    parser.add_argument('-p', '--periods', type=int, default=6, help="months to forecast")
+    parser.add_argument('-s', '--state', default=STATE_PATH, help="JSON file with the saved states")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="number of processes for refits (default: all cores)")
+    parser.add_argument('-o', '--output', default='segment_forecasts.csv')
+    parser.add_argument('--as-of', default=None, help="only use months that ended before this date (default: today)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    forecasts, counts = update_forecasts(load_and_clean_data(args.input), args.periods, args.state, args.workers,
+                                         as_of=args.as_of)
+    forecasts.to_csv(args.output, index=False)
+    print(', '.join(f"{name}: {count}" for name, count in counts.items()))
+    print(f"Wrote {len(forecasts)} forecasts to {args.output} in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
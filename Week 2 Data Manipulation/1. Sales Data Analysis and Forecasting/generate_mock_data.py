@@ -1,40 +1,247 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-
-def generate_mock_sales_data(num_records=1000):
-    # Set random seed for reproducibility
-    np.random.seed(42)
-    
-    # Generate dates
-    start_date = datetime(2022, 1, 1)
-    dates = [start_date + timedelta(days=x) for x in range(num_records)]
-    
-    # Create product list
-    products = [f'Product_{i}' for i in range(1, 21)]
-    
-    # Create regions
-    regions = ['North', 'South', 'East', 'West', 'Central']
-    
-    # Generate random data
-    data = {
-        'date': dates,
-        'product': np.random.choice(products, num_records),
-        'region': np.random.choice(regions, num_records),
-        'quantity': np.random.randint(1, 100, num_records),
-        'price': np.random.uniform(10, 1000, num_records).round(2)
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is needed for Parquet output and makes CSV output faster
+    pa = None
+
+# Rows generated and written at a time
+CHUNK_SIZE = 1_000_000
+
+# Data rows that fit on one Excel sheet (the header takes one more)
+EXCEL_MAX_ROWS = 1_048_575
+
+REGIONS = ['North', 'South', 'East', 'West', 'Central']
+
+# Columns of each output schema: 'sales' is sales_data.csv (one date per
+# row), 'sample' is sample_sales_data.csv of the Sales and Revenue Analysis
+# project (timestamps, product_name and revenue)
+SCHEMAS = {
+    'sales': ['date', 'product', 'region', 'quantity', 'price'],
+    'sample': ['date', 'product_name', 'quantity', 'revenue', 'region'],
+}
+
+# Share of missing values per column when none are given
+DEFAULT_MISSING_RATES = {
+    'sales': {'quantity': 0.05},
+    'sample': {'quantity': 0.01},
+}
+
+FORMATS = {'.csv': 'csv', '.parquet': 'parquet', '.xlsx': 'excel'}
+
+def daily_weights(start_date, days, trend=0.5, seasonality=0.3):
+    """Relative number of transactions per day, with a linear trend over the
+    whole period, a yearly cycle peaking in December and busier weekends"""
+    dates = pd.date_range(start_date, periods=days, freq='D')
+    growth = 1 + trend * np.arange(days) / max(days - 1, 1)
+    yearly = 1 + seasonality * np.cos(2 * np.pi * (dates.dayofyear.to_numpy() - 350) / 365.25)
+    weekly = np.where(dates.dayofweek.to_numpy() >= 5, 1.3, 1.0)
+    weights = growth * yearly * weekly
+    return weights / weights.sum()
+
+def product_weights(num_products, skew=1.1):
+    """Zipf-like popularity: product k sells in proportion to 1 / k**skew"""
+    weights = 1 / np.arange(1, num_products + 1) ** skew
+    return weights / weights.sum()
+
+def make_settings(num_records, schema='sales', start_date='2022-01-01', days=1000, num_products=20,
+                  missing_rates=None, seed=42, chunk_size=CHUNK_SIZE, trend=0.5, seasonality=0.3, skew=1.1):
+    """Everything a worker needs to generate any chunk of the dataset
+
+    The number of rows per day is drawn once from the seed, so chunk i is
+    the same no matter which shard or process generates it.
+    """
+    rng = np.random.default_rng(seed)
+    rows_per_day = rng.multinomial(num_records, daily_weights(start_date, days, trend, seasonality))
+    return {
+        'num_records': num_records,
+        'schema': schema,
+        'start_date': np.datetime64(start_date, 'D'),
+        'day_ends': np.cumsum(rows_per_day),
+        'products': [f'Product_{i}' for i in range(1, num_products + 1)],
+        'product_weights': product_weights(num_products, skew),
+        'product_prices': rng.uniform(10, 1000, num_products),
+        'missing_rates': DEFAULT_MISSING_RATES[schema] if missing_rates is None else missing_rates,
+        'seed': seed,
+        'chunk_size': chunk_size,
     }
-    
-    # Create DataFrame
+
+def generate_chunk(settings, chunk_index):
+    """Build rows [chunk_index * chunk_size, ...) of the dataset as a DataFrame"""
+    start = chunk_index * settings['chunk_size']
+    stop = min(start + settings['chunk_size'], settings['num_records'])
+    size = stop - start
+    rng = np.random.default_rng([settings['seed'], chunk_index + 1])
+
+    day = np.searchsorted(settings['day_ends'], np.arange(start, stop), side='right')
+    dates = settings['start_date'] + day.astype('timedelta64[D]')
+    product = rng.choice(len(settings['products']), size, p=settings['product_weights'])
+    region = rng.integers(0, len(REGIONS), size)
+    quantity = rng.integers(1, 100, size).astype(float)
+    price = (settings['product_prices'][product] * rng.uniform(0.9, 1.1, size)).round(2)
+
+    if settings['schema'] == 'sales':
+        data = {
+            'date': dates,
+            'product': pd.Categorical.from_codes(product, settings['products']),
+            'region': pd.Categorical.from_codes(region, REGIONS),
+            'quantity': quantity,
+            'price': price,
+        }
+    else:
+        # Sales happen during opening hours, mostly in the afternoon
+        seconds = np.clip(rng.normal(14 * 3600, 3 * 3600, size), 8 * 3600, 21 * 3600 - 1).astype('timedelta64[s]')
+        data = {
+            'date': dates.astype('datetime64[s]') + seconds,
+            'product_name': pd.Categorical.from_codes(product, settings['products']),
+            'quantity': quantity,
+            'revenue': (quantity * price).round(2),
+            'region': pd.Categorical.from_codes(region, REGIONS),
+        }
     df = pd.DataFrame(data)
-    
-    # Add some missing values
-    mask = np.random.random(num_records) < 0.05
-    df.loc[mask, 'quantity'] = np.nan
-    
-    # Save to CSV
-    df.to_csv('sales_data.csv', index=False)
-    print("Mock sales data generated and saved to 'sales_data.csv'")
+
+    for column, rate in settings['missing_rates'].items():
+        df.loc[rng.random(size) < rate, column] = np.nan
+    if 'revenue' in df.columns:
+        # Revenue was derived from quantity, so it is unknown wherever quantity is
+        df.loc[df['quantity'].isna(), 'revenue'] = np.nan
+    return df
+
+def shard_ranges(num_records, shards):
+    """Split rows [0, num_records) into shards whose row counts differ by at most one"""
+    bounds = [num_records * shard // shards for shard in range(shards + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def generate_rows(settings, start, stop):
+    """Yield rows [start, stop) of the dataset, one chunk (or part of one) at a time
+
+    Rows are cut out of the same chunks generate_chunk builds, so a row has
+    the same values however the dataset is sharded.
+    """
+    chunk_size = settings['chunk_size']
+    for chunk_index in range(start // chunk_size, -(-stop // chunk_size)):
+        chunk_start = chunk_index * chunk_size
+        df = generate_chunk(settings, chunk_index)
+        if start > chunk_start or stop < chunk_start + len(df):
+            df = df.iloc[max(start - chunk_start, 0):stop - chunk_start]
+        yield df
+
+def write_shard(settings, path, file_format, row_range):
+    """Generate rows [start, stop) and write them to one file; return the row count"""
+    date_format = '%Y-%m-%d' if settings['schema'] == 'sales' else '%Y-%m-%d %H:%M:%S'
+    rows = 0
+    if file_format == 'csv' and pa is not None:
+        # pyarrow writes CSV several times faster than DataFrame.to_csv; the
+        # generated values never need quoting
+        date_type = pa.date32() if settings['schema'] == 'sales' else pa.timestamp('s')
+        options = pa_csv.WriteOptions(include_header=False, quoting_style='none')
+        with open(path, 'wb') as f:
+            f.write((','.join(SCHEMAS[settings['schema']]) + '\n').encode())
+            writer = None
+            for df in generate_rows(settings, *row_range):
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                table = table.set_column(0, 'date', table['date'].cast(date_type).cast(pa.string()))
+                writer = writer or pa_csv.CSVWriter(f, table.schema, write_options=options)
+                writer.write_table(table)
+                rows += table.num_rows
+            if writer is not None:
+                writer.close()
+    elif file_format == 'csv':
+        for i, df in enumerate(generate_rows(settings, *row_range)):
+            df.to_csv(path, mode='a' if i else 'w', header=not i, index=False, date_format=date_format)
+            rows += len(df)
+    elif file_format == 'parquet':
+        writer = None
+        try:
+            for df in generate_rows(settings, *row_range):
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                writer = writer or pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                rows += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        with pd.ExcelWriter(path) as writer:
+            for i, df in enumerate(generate_rows(settings, *row_range)):
+                df.to_excel(writer, index=False, header=not i, startrow=rows + (1 if i else 0))
+                rows += len(df)
+    return rows
+
+def shard_paths(output_path, shards):
+    if shards == 1:
+        return [output_path]
+    stem, extension = os.path.splitext(output_path)
+    return [f'{stem}-{shard:05d}{extension}' for shard in range(shards)]
+
+def generate_mock_sales_data(num_records=1000, output_path='sales_data.csv', shards=1, workers=None, **options):
+    """Generate mock sales data and write it in chunks to CSV, Parquet or Excel
+
+    The format follows the file extension. With several shards each one is
+    written to its own numbered file, in parallel on a process pool. Other
+    options (schema, days, num_products, missing_rates, seed, ...) are
+    passed to make_settings. Returns the list of files written.
+    """
+    file_format = FORMATS.get(os.path.splitext(output_path)[1].lower())
+    if file_format is None:
+        raise ValueError("Unsupported file format. Please use .csv, .parquet or .xlsx.")
+    if file_format == 'parquet' and pa is None:
+        raise ValueError("Writing Parquet files needs pyarrow.")
+
+    settings = make_settings(num_records, **options)
+    shards = max(1, min(shards, num_records))
+    row_ranges = shard_ranges(num_records, shards)
+    largest = max(stop - start for start, stop in row_ranges)
+    if file_format == 'excel' and largest > EXCEL_MAX_ROWS:
+        raise ValueError(f"An Excel sheet holds at most {EXCEL_MAX_ROWS} rows and the largest shard has "
+                         f"{largest}; use more shards.")
+
+    paths = shard_paths(output_path, shards)
+    workers = min(workers or os.cpu_count() or 1, shards)
+    if workers == 1:
+        for path, row_range in zip(paths, row_ranges):
+            write_shard(settings, path, file_format, row_range)
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            list(executor.map(write_shard, [settings] * shards, paths, [file_format] * shards, row_ranges))
+    return paths
+
+def parse_missing_rates(values):
+    """Turn ['quantity=0.05', ...] into {'quantity': 0.05, ...}"""
+    rates = {}
+    for value in values:
+        column, _, rate = value.partition('=')
+        rates[column] = float(rate)
+    return rates
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate mock sales data.")
+    parser.add_argument('-n', '--rows', type=int, default=1000, help="number of transactions")
+    parser.add_argument('-o', '--output', default='sales_data.csv', help="output file (.csv, .parquet or .xlsx)")
+    parser.add_argument('--schema', choices=list(SCHEMAS), default='sales')
+    parser.add_argument('--start-date', default='2022-01-01')
+    parser.add_argument('--days', type=int, default=1000)
+    parser.add_argument('--products', type=int, default=20)
+    parser.add_argument('--missing', nargs='*', metavar='COLUMN=RATE', help="share of missing values per column")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--shards', type=int, default=1, help="number of output files")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="processes writing shards (default: all cores)")
+    args = parser.parse_args()
+
+    paths = generate_mock_sales_data(
+        args.rows, args.output, args.shards, args.workers,
+        schema=args.schema, start_date=args.start_date, days=args.days, num_products=args.products,
+        missing_rates=None if args.missing is None else parse_missing_rates(args.missing),
+        seed=args.seed, chunk_size=args.chunk_size,
+    )
+    print(f"Mock sales data generated and saved to {', '.join(repr(path) for path in paths)}")
 
 if __name__ == "__main__":
-    generate_mock_sales_data() 
\ No newline at end of file
+    main()
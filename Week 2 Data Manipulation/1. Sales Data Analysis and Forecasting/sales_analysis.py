@@ -1,36 +1,89 @@
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 from statsmodels.tsa.holtwinters import ExponentialSmoothing
+from data_cache import DataCache
 
-def load_and_clean_data(file_path):
-    """Load and clean the sales data"""
-    # Read the CSV file
-    df = pd.read_csv(file_path)
-    
+# Columns whose missing values are filled with the column mean
+FILL_COLUMNS = ['quantity', 'price']
+
+# Columns stored as categoricals in the cache
+CATEGORY_COLUMNS = ['product', 'region']
+
+# Version of the cleaning steps; change it when clean_chunk changes so old
+# cached frames are not reused
+CLEANING_VERSION = 'cleaned-v1'
+
+# Rows read at a time in streaming mode, and the file size (bytes) above
+# which main() switches to streaming mode
+CHUNK_SIZE = 500_000
+STREAMING_THRESHOLD = 500 * 1024 * 1024
+
+def clean_chunk(df, fill_means):
+    """Convert dates, fill missing values and add the total amount"""
     # Convert date column to datetime
     df['date'] = pd.to_datetime(df['date'])
     
     # Handle missing values
-    df['quantity'].fillna(df['quantity'].mean(), inplace=True)
-    df['price'].fillna(df['price'].mean(), inplace=True)
+    df[FILL_COLUMNS] = df[FILL_COLUMNS].fillna(fill_means)
     
     # Calculate total sale amount
     df['total_amount'] = df['quantity'] * df['price']
     
     return df
 
+def load_and_clean_data(file_path, use_cache=True):
+    """Load and clean the sales data, reusing the cached result when the file is unchanged"""
+    if use_cache:
+        return DataCache().load(file_path, lambda path: load_and_clean_data(path, use_cache=False),
+                                CLEANING_VERSION, CATEGORY_COLUMNS)
+    
+    # Read the CSV file
+    df = pd.read_csv(file_path)
+    return clean_chunk(df, df[FILL_COLUMNS].mean())
+
+def compute_fill_means(file_path, chunksize=CHUNK_SIZE):
+    """Compute the column means used to fill missing values, one chunk at a time"""
+    sums = pd.Series(0.0, index=FILL_COLUMNS)
+    counts = pd.Series(0, index=FILL_COLUMNS)
+    for chunk in pd.read_csv(file_path, usecols=FILL_COLUMNS, chunksize=chunksize):
+        sums += chunk.sum()
+        counts += chunk.count()
+    return sums / counts
+
+def analyze_sales_chunked(file_path, chunksize=CHUNK_SIZE):
+    """Run analyze_sales over a CSV file that does not fit in memory
+    
+    The first pass reads only the numeric columns to get the fill means.
+    The second pass cleans each chunk the same way as load_and_clean_data
+    and adds its monthly, product and region totals to running totals,
+    so memory is bounded by the chunk size and the number of groups.
+    """
+    fill_means = compute_fill_means(file_path, chunksize)
+    
+    totals = None
+    for chunk in pd.read_csv(file_path, chunksize=chunksize):
+        chunk_totals = analyze_sales(clean_chunk(chunk, fill_means))
+        if totals is None:
+            totals = chunk_totals
+        else:
+            totals = [total.add(part, fill_value=0) for total, part in zip(totals, chunk_totals)]
+    
+    monthly_sales, product_sales, region_sales = totals
+    return monthly_sales.sort_index(), product_sales.sort_values(ascending=False), region_sales.sort_index()
+
 def analyze_sales(df):
     """Perform basic sales analysis"""
     # Monthly sales
     monthly_sales = df.groupby(df['date'].dt.to_period('M'))['total_amount'].sum()
     
     # Sales by product
-    product_sales = df.groupby('product')['total_amount'].sum().sort_values(ascending=False)
+    product_sales = df.groupby('product', observed=True)['total_amount'].sum().sort_values(ascending=False)
     
     # Sales by region
-    region_sales = df.groupby('region')['total_amount'].sum()
+    region_sales = df.groupby('region', observed=True)['total_amount'].sum()
     
     return monthly_sales, product_sales, region_sales
 
@@ -82,11 +135,17 @@ def forecast_sales(monthly_sales, periods=6):
     return forecast
 
 def main():
-    # Load and clean data
-    df = load_and_clean_data('sales_data.csv')
-    
-    # Perform analysis
-    monthly_sales, product_sales, region_sales = analyze_sales(df)
+    file_path = 'sales_data.csv'
+    
+    if os.path.getsize(file_path) > STREAMING_THRESHOLD:
+        # Stream large files in chunks instead of loading them at once
+        monthly_sales, product_sales, region_sales = analyze_sales_chunked(file_path)
+    else:
+        # Load and clean data
+        df = load_and_clean_data(file_path)
+        
+        # Perform analysis
+        monthly_sales, product_sales, region_sales = analyze_sales(df)
     
     # Create visualizations
     create_visualizations(monthly_sales, product_sales, region_sales)
@@ -1,10 +1,20 @@
+import numpy as np
 import pandas as pd
+from heavy_hitters import SpaceSavingSketch
+from rollup import SalesRollup
+
+# analyze_all sums over the whole month x product x region cube when it has
+# at most this many cells per row of data, and per view otherwise
+CUBE_CELLS_PER_ROW = 1
 
 class SalesAnalyzer:
     def calculate_monthly_sales(self, df):
         """
         Calculate monthly sales trends
         """
+        if isinstance(df, SalesRollup):
+            return df.monthly_sales()
+        
         monthly_sales = df.groupby(df['date'].dt.strftime('%Y-%m')).agg({
             'revenue': 'sum',
             'quantity': 'sum'
@@ -16,18 +26,133 @@ class SalesAnalyzer:
         """
         Identify best-performing products
         """
-        top_products = df.groupby('product_name').agg({
+        if isinstance(df, SalesRollup):
+            return df.top_products(top_n)
+        
+        # nlargest selects the top rows without sorting every product
+        top_products = df.groupby('product_name', observed=True).agg({
             'revenue': 'sum',
             'quantity': 'sum'
-        }).sort_values('revenue', ascending=False).head(top_n)
+        }).nlargest(top_n, 'revenue')
         return top_products
     
+    def stream_top_products(self, chunks, top_n=10, capacity=1000):
+        """
+        Approximate identify_top_products over an iterable of row chunks,
+        keeping at most `capacity` products in memory. Returns the top
+        products (with a revenue_lower bound and a guaranteed flag, see
+        SpaceSavingSketch.top) and the sketch, whose error_bound is the
+        largest possible revenue overcount.
+        """
+        sketch = SpaceSavingSketch(capacity)
+        for chunk in chunks:
+            sketch.update(chunk)
+        return sketch.top(top_n), sketch
+    
     def analyze_regional_performance(self, df):
         """
         Analyze sales performance by region
         """
-        regional_performance = df.groupby('region').agg({
+        if isinstance(df, SalesRollup):
+            return df.regional_performance()
+        
+        regional_performance = df.groupby('region', observed=True).agg({
             'revenue': 'sum',
             'quantity': 'sum'
         }).sort_values('revenue', ascending=False)
         return regional_performance
+    
+    def analyze_all(self, df, top_n=10):
+        """
+        Compute calculate_monthly_sales, identify_top_products and
+        analyze_regional_performance in one pass. Month, product and region
+        are turned into integer codes once and all sums come from
+        np.bincount over the shared codes.
+        """
+        month_codes, months = self._month_codes(df['date'])
+        product_codes, products = self._codes(df['product_name'])
+        region_codes, regions = self._codes(df['region'])
+        
+        # Missing keys go to an extra last code, which each view drops, so a
+        # row missing its region still counts for its month and product
+        sizes = []
+        for codes, labels in ((month_codes, months), (product_codes, products), (region_codes, regions)):
+            codes[codes < 0] = len(labels)
+            sizes.append(len(labels) + 1)
+        
+        measures = {column: self._weights(df[column]) for column in ('revenue', 'quantity')}
+        cells = sizes[0] * sizes[1] * sizes[2]
+        if cells <= max(len(df), 1) * CUBE_CELLS_PER_ROW:
+            # One bincount per measure over the combined code, then the
+            # small cube is summed along its axes
+            combined = month_codes * sizes[1]
+            combined += product_codes
+            combined *= sizes[2]
+            combined += region_codes
+            counts = np.bincount(combined, minlength=cells).reshape(sizes)
+            cubes = {column: np.bincount(combined, weights, minlength=cells).reshape(sizes)
+                     for column, weights in measures.items()}
+            views = [
+                (counts.sum(axis=(1, 2)), {column: cube.sum(axis=(1, 2)) for column, cube in cubes.items()}),
+                (counts.sum(axis=(0, 2)), {column: cube.sum(axis=(0, 2)) for column, cube in cubes.items()}),
+                (counts.sum(axis=(0, 1)), {column: cube.sum(axis=(0, 1)) for column, cube in cubes.items()}),
+            ]
+        else:
+            views = []
+            for codes, size in zip((month_codes, product_codes, region_codes), sizes):
+                views.append((np.bincount(codes, minlength=size),
+                              {column: np.bincount(codes, weights, minlength=size)
+                               for column, weights in measures.items()}))
+        
+        frames = []
+        for (counts, sums), labels, name in zip(views, (months, products, regions), ('date', 'product_name', 'region')):
+            present = counts[:-1] > 0
+            frame = pd.DataFrame({column: values[:-1][present] for column, values in sums.items()},
+                                 index=pd.Index(labels[present], name=name))
+            for column in measures:
+                if pd.api.types.is_integer_dtype(df[column].dtype):
+                    frame[column] = frame[column].astype('int64')
+            frames.append(frame)
+        
+        monthly_sales = frames[0].reset_index()
+        top_products = frames[1].nlargest(top_n, 'revenue')
+        regional_performance = frames[2].sort_values('revenue', ascending=False)
+        return monthly_sales, top_products, regional_performance
+    
+    @staticmethod
+    def _month_codes(dates):
+        """
+        Month number of every date relative to the first month, and the
+        first-of-month timestamps; missing dates get -1
+        """
+        codes = dates.to_numpy().astype('datetime64[M]').view('int64')
+        missing = codes == np.iinfo(np.int64).min  # NaT
+        if missing.all():
+            return np.full(len(codes), -1), pd.DatetimeIndex([])
+        present = codes[~missing] if missing.any() else codes
+        first, last = present.min(), present.max()
+        codes -= first
+        codes[missing] = -1
+        labels = np.arange(first, last + 1).astype('datetime64[M]')
+        return codes, pd.DatetimeIndex(labels.astype('datetime64[ns]'))
+    
+    @staticmethod
+    def _codes(values):
+        """
+        Integer codes and sorted labels, reusing the codes of categoricals;
+        missing values get -1
+        """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return values.cat.codes.to_numpy().astype(np.intp), values.cat.categories
+        codes, labels = pd.factorize(values, sort=True)
+        return codes.astype(np.intp, copy=False), labels
+    
+    @staticmethod
+    def _weights(values):
+        """
+        Float64 values for np.bincount, with missing values counted as 0
+        like groupby's sum
+        """
+        weights = values.to_numpy(dtype='float64', na_value=np.nan)
+        missing = np.isnan(weights)
+        return np.where(missing, 0.0, weights) if missing.any() else weights
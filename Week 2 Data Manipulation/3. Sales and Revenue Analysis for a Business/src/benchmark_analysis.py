@@ -0,0 +1,54 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from analysis import SalesAnalyzer
+
+def make_sales_frame(rows, products=1000, seed=0):
+    """Cleaned sales data as DataProcessor returns it, built directly in memory"""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64('2022-01-01T00:00:00', 's').astype('int64')
+    seconds = rng.integers(0, 3 * 365 * 24 * 3600, rows) + start
+    return pd.DataFrame({
+        'date': seconds.astype('datetime64[s]'),
+        'product_name': pd.Categorical.from_codes(rng.integers(0, products, rows),
+                                                  [f'Product_{i}' for i in range(1, products + 1)]),
+        'quantity': rng.integers(1, 100, rows, dtype=np.int8),
+        'revenue': rng.uniform(10, 10000, rows).round(2),
+        'region': pd.Categorical.from_codes(rng.integers(0, 5, rows), ['North', 'South', 'East', 'West', 'Central']),
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the three SalesAnalyzer methods with analyze_all.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--products', type=int, default=1000)
+    parser.add_argument('--skip-separate', action='store_true',
+                        help="only time analyze_all (the separate methods take minutes at 10^8 rows)")
+    args = parser.parse_args()
+
+    analyzer = SalesAnalyzer()
+    print(f"{'Rows':>11} {'Separate s':>11} {'analyze_all s':>14} {'Speedup':>8}")
+    print("-" * 47)
+    for rows in args.rows:
+        df = make_sales_frame(rows, args.products)
+
+        start = time.perf_counter()
+        combined = analyzer.analyze_all(df)
+        combined_seconds = time.perf_counter() - start
+
+        if args.skip_separate:
+            print(f"{rows:>11} {'-':>11} {combined_seconds:>14.2f} {'-':>8}")
+            continue
+
+        start = time.perf_counter()
+        separate = (analyzer.calculate_monthly_sales(df), analyzer.identify_top_products(df),
+                    analyzer.analyze_regional_performance(df))
+        separate_seconds = time.perf_counter() - start
+
+        for expected, actual in zip(separate, combined):
+            pd.testing.assert_frame_equal(expected, actual, check_dtype=False, check_index_type=False,
+                                          check_categorical=False, check_exact=False, rtol=1e-9)
+        print(f"{rows:>11} {separate_seconds:>11.2f} {combined_seconds:>14.2f} {separate_seconds / combined_seconds:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
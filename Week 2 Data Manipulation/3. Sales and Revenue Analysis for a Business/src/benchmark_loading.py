@@ -0,0 +1,64 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from data_processor import DataProcessor
+
+try:
+    import resource
+except ImportError:  # not available on Windows; peak memory is then not reported
+    resource = None
+
+# DataProcessor options of each load path; 'current' is the untyped read
+# followed by clean_data's date conversion
+VARIANTS = {
+    'current': dict(typed=False),
+    'typed': dict(),
+    'typed + pyarrow engine': dict(engine='pyarrow'),
+    'typed + pyarrow dtypes': dict(engine='pyarrow', dtype_backend='pyarrow'),
+}
+
+def measure(file_path, options):
+    """Load and clean the file once; return (rows, load s, clean s, frame bytes, peak RSS bytes)"""
+    processor = DataProcessor(use_cache=False, **options)
+    start = time.perf_counter()
+    df = processor.load_data(file_path)
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    df = processor.clean_data(df)
+    clean_seconds = time.perf_counter() - start
+
+    peak = None
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == 'darwin' else 1024
+    return len(df), load_seconds, clean_seconds, int(df.memory_usage(deep=True).sum()), peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory use and throughput of the DataProcessor load paths.")
+    parser.add_argument('input', nargs='?', default='data/benchmark_sales_data.csv')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"{args.input} not found. Generate a 10^7-row file with:\n"
+              f'  python "../1. Sales Data Analysis and Forecasting/generate_mock_data.py" '
+              f"--rows 10000000 --schema sample -o {args.input}")
+        return
+
+    size_mb = os.path.getsize(args.input) / 1e6
+    print(f"{args.input}: {size_mb:.0f} MB")
+    print(f"{'Load path':<24} {'Rows':>10} {'Load s':>7} {'Clean s':>8} {'MB/s':>7} {'Frame MB':>9} {'Peak MB':>8}")
+    print("-" * 79)
+    for name, options in VARIANTS.items():
+        # A fresh process per load path, so peak memory is not shared
+        with ProcessPoolExecutor(1) as executor:
+            rows, load, clean, frame_bytes, peak = executor.submit(measure, args.input, options).result()
+        peak_text = f"{peak / 1e6:>8.0f}" if peak is not None else f"{'n/a':>8}"
+        print(f"{name:<24} {rows:>10} {load:>7.2f} {clean:>8.2f} {size_mb / (load + clean):>7.1f} "
+              f"{frame_bytes / 1e6:>9.0f} {peak_text}")
+
+if __name__ == "__main__":
+    main()
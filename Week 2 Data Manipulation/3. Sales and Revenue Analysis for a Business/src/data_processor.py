@@ -1,17 +1,115 @@
+import numpy as np
 import pandas as pd
+from data_cache import DataCache
 
 class DataProcessor:
+    # Version of the cleaning steps, part of the cache key
+    cleaning_version = 'clean-v2'
+    category_columns = ['product_name', 'region']
+
+    # Declared types of the sales data columns. 'integer' columns are
+    # downcast to the smallest integer type that holds them (NumPy columns
+    # with missing values stay float64 until clean_data drops them);
+    # 'float' columns stay float64 so revenue keeps its cents. Columns not
+    # listed here are left to pandas.
+    schema = {
+        'date': 'datetime',
+        'product_name': 'category',
+        'region': 'category',
+        'quantity': 'integer',
+        'revenue': 'float',
+    }
+
+    def __init__(self, cache_dir=None, use_cache=True, typed=True, engine=None, dtype_backend=None):
+        """
+        engine is passed to pd.read_csv ('c' by default, or 'pyarrow') and
+        dtype_backend='pyarrow' keeps numbers and dates in pyarrow-backed
+        dtypes; typed=False reads the files without the schema
+        """
+        self.cache = DataCache(cache_dir) if use_cache else None
+        self.typed = typed
+        self.engine = engine
+        self.dtype_backend = dtype_backend
+    
     def load_data(self, file_path):
         """
         Load data from CSV or Excel file
         """
         if file_path.endswith('.csv'):
-            return pd.read_csv(file_path, skipinitialspace=True)
+            if not self.typed:
+                return pd.read_csv(file_path, skipinitialspace=True)
+            return self._read_typed_csv(file_path)
         elif file_path.endswith(('.xlsx', '.xls')):
-            return pd.read_excel(file_path)
+            df = pd.read_excel(file_path)
+            return self.apply_schema(df) if self.typed else df
         else:
             raise ValueError("Unsupported file format. Please use CSV or Excel files.")
     
+    def _read_typed_csv(self, file_path):
+        """
+        Read a CSV file with the declared types, parsing dates while reading
+        """
+        options = {}
+        if self.dtype_backend:
+            options['dtype_backend'] = self.dtype_backend
+        
+        if self.engine == 'pyarrow':
+            # The pyarrow engine parses dates and numbers itself but does not
+            # support skipinitialspace, so header names are stripped afterwards
+            df = pd.read_csv(file_path, engine='pyarrow', **options)
+            df.columns = df.columns.str.strip()
+            return self.apply_schema(df)
+        
+        columns = pd.read_csv(file_path, nrows=0, skipinitialspace=True).columns
+        declared = {column: self.schema[column] for column in columns if column in self.schema}
+        dtypes = {column: 'category' if kind == 'category' else 'float64'
+                  for column, kind in declared.items() if kind in ('category', 'integer', 'float')}
+        df = pd.read_csv(
+            file_path,
+            skipinitialspace=True,
+            dtype=dtypes,
+            parse_dates=[column for column, kind in declared.items() if kind == 'datetime'],
+            engine=self.engine,
+            **options
+        )
+        return self.apply_schema(df)
+    
+    def apply_schema(self, df):
+        """
+        Convert the columns of an already loaded frame to the declared types
+        """
+        for column, kind in self.schema.items():
+            if column not in df.columns:
+                continue
+            if kind == 'datetime':
+                if not pd.api.types.is_datetime64_any_dtype(df[column]):
+                    df[column] = pd.to_datetime(df[column])
+            elif kind == 'category':
+                if not isinstance(df[column].dtype, pd.CategoricalDtype):
+                    df[column] = df[column].astype('category')
+            elif kind == 'integer':
+                df[column] = self._downcast_integer(df[column])
+            else:
+                df[column] = df[column].astype('double[pyarrow]' if self.dtype_backend == 'pyarrow' else 'float64')
+        return df
+    
+    def _downcast_integer(self, series):
+        """
+        Smallest integer type for a whole-number column; pyarrow-backed
+        integers can hold missing values, NumPy ones cannot
+        """
+        values = series.to_numpy(dtype='float64', na_value=np.nan)
+        present = values[~np.isnan(values)]
+        if present.size and not np.array_equal(present, np.round(present)):
+            return series.astype('float64')
+        
+        smallest = pd.to_numeric(pd.Series(present, dtype='int64'), downcast='integer').dtype
+        if self.dtype_backend == 'pyarrow':
+            return series.astype(f'{smallest.name}[pyarrow]')
+        if present.size < values.size:
+            return series.astype('float64')
+        return series.astype(smallest)
+    
     def clean_data(self, df):
         """
         Clean and preprocess the data
@@ -23,7 +121,38 @@ class DataProcessor:
         df = df.dropna()
         
         # Convert date column to datetime
-        if 'date' in df.columns:
+        if 'date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['date']):
             df['date'] = pd.to_datetime(df['date'])
         
+        # Columns that had missing values can be downcast now
+        if self.typed:
+            df = self.apply_schema(df)
+        
         return df
+    
+    def iter_clean_chunks(self, file_path, chunksize=500_000):
+        """
+        Load and clean a CSV file chunksize rows at a time; duplicates are
+        only dropped within a chunk
+        """
+        columns = pd.read_csv(file_path, nrows=0, skipinitialspace=True).columns
+        for chunk in pd.read_csv(file_path, skipinitialspace=True, chunksize=chunksize,
+                                 dtype={column: 'float64' for column in columns
+                                        if self.schema.get(column) in ('integer', 'float')}):
+            yield self.clean_data(self.apply_schema(chunk) if self.typed else chunk)
+    
+    def load_clean_data(self, file_path):
+        """
+        Load and clean a file, reusing the cached cleaned frame while the
+        source file is unchanged; each combination of load options has its
+        own cached copy
+        """
+        if self.cache is None:
+            return self.clean_data(self.load_data(file_path))
+        typed = 'typed' if self.typed else 'untyped'
+        return self.cache.load(
+            file_path,
+            lambda path: self.clean_data(self.load_data(path)),
+            f"{self.cleaning_version}-{typed}-{self.engine or 'c'}-{self.dtype_backend or 'numpy'}",
+            self.category_columns if self.typed else ()
+        )
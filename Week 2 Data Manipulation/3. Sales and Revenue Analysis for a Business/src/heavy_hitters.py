@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+class SpaceSavingSketch:
+    """
+    Weighted Space-Saving summary of the heaviest keys in a stream of
+    row chunks, holding at most `capacity` keys.
+
+    Each chunk is summed per key and merged into the summary: keys already
+    tracked add their chunk total, new keys start from the summary's
+    smallest count (which bounds what they could have had before), and only
+    the `capacity` largest counts are kept. Estimates never undercount, and
+    each key's overcount is at most its `error`, which is at most
+    total_weight / capacity.
+    """
+
+    def __init__(self, capacity=1000, key='product_name', weight='revenue', extra=('quantity',)):
+        self.capacity = capacity
+        self.key = key
+        self.weight = weight
+        self.extra = list(extra)
+        self.total_weight = 0.0
+        self.table = pd.DataFrame({'count': [], 'error': [], **{column: [] for column in self.extra}},
+                                  index=pd.Index([], dtype=object, name=key), dtype='float64')
+
+    @property
+    def floor(self):
+        """
+        Count a key not in the summary may have had at most
+        """
+        return self.table['count'].min() if len(self.table) >= self.capacity else 0.0
+
+    @property
+    def error_bound(self):
+        """
+        Largest possible overcount of any estimate
+        """
+        return self.floor
+
+    def update(self, chunk):
+        columns = [self.weight] + [column for column in self.extra if column in chunk.columns]
+        totals = chunk.groupby(self.key, observed=True, sort=False)[columns].sum()
+        totals.index = totals.index.astype(object)
+        self.total_weight += float(totals[self.weight].sum())
+
+        floor = self.floor
+        table = self.table.reindex(self.table.index.union(totals.index, sort=False))
+        totals = totals.reindex(table.index, fill_value=0)
+        table['count'] = table['count'].fillna(floor) + totals[self.weight]
+        table['error'] = table['error'].fillna(floor)
+        for column in self.extra:
+            # Extra columns are only summed while a key is tracked
+            table[column] = table[column].fillna(0) + (totals[column] if column in totals else 0)
+
+        if len(table) > self.capacity:
+            keep = np.argpartition(-table['count'].to_numpy(), self.capacity - 1)[:self.capacity]
+            table = table.iloc[np.sort(keep)]
+        self.table = table
+        return self
+
+    def top(self, top_n=10):
+        """
+        The top_n keys by estimated weight, with the estimate, its lower
+        bound, the extra columns and whether the key is certainly in the
+        true top_n (its lower bound is at least the next estimate)
+        """
+        ranked = self.table.nlargest(top_n + 1, 'count')
+        top = ranked.head(top_n)
+        next_count = ranked['count'].iloc[top_n] if len(ranked) > top_n else self.floor
+        result = pd.DataFrame({
+            self.weight: top['count'],
+            f'{self.weight}_lower': top['count'] - top['error'],
+            **{column: top[column] for column in self.extra},
+        })
+        result['guaranteed'] = result[f'{self.weight}_lower'] >= next_count
+        return result
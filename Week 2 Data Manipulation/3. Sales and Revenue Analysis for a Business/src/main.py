@@ -17,8 +17,7 @@ def main():
     
     try:
         # Load and process data
-        df = processor.load_data("data/sample_sales_data.csv")
-        cleaned_df = processor.clean_data(df)
+        cleaned_df = processor.load_clean_data("data/sample_sales_data.csv")
         
         # Perform analysis
         monthly_sales = analyzer.calculate_monthly_sales(cleaned_df)
@@ -26,9 +25,9 @@ def main():
         regional_performance = analyzer.analyze_regional_performance(cleaned_df)
         
         # Create visualizations
-        visualizer.plot_monthly_trends(monthly_sales)
-        visualizer.plot_top_products(top_products)
-        visualizer.create_sales_heatmap(cleaned_df)
+        # Charts whose inputs have not changed since the last run are skipped
+        rendered = visualizer.render_all(monthly_sales, top_products, cleaned_df)
+        print(f"Rendered charts: {', '.join(rendered) or 'none (all up to date)'}")
         
         print("Analysis completed successfully!")
         
@@ -0,0 +1,135 @@
+import json
+import os
+import pandas as pd
+
+class SalesRollup:
+    """
+    Revenue, quantity and row count summed per month, product, region, hour
+    and day of week. New batches of cleaned rows are merged in with append(),
+    and the SalesAnalyzer methods and DataVisualizer.create_sales_heatmap
+    accept a rollup in place of the raw data frame.
+    """
+    keys = ['month', 'product_name', 'region', 'hour', 'dayofweek']
+    measures = ['revenue', 'quantity', 'rows']
+
+    def __init__(self, cube=None, batches=()):
+        self.cube = cube if cube is not None else self._empty_cube()
+        self.batches = list(batches)
+
+    @classmethod
+    def _empty_cube(cls):
+        return pd.DataFrame({
+            'month': pd.Series(dtype='datetime64[ns]'),
+            'product_name': pd.Series(dtype='category'),
+            'region': pd.Series(dtype='category'),
+            'hour': pd.Series(dtype='int8'),
+            'dayofweek': pd.Series(dtype='int8'),
+            'revenue': pd.Series(dtype='float64'),
+            'quantity': pd.Series(dtype='float64'),
+            'rows': pd.Series(dtype='int64'),
+        })
+
+    @staticmethod
+    def _paths(path):
+        stem = os.path.splitext(path)[0]
+        return stem + '.feather', stem + '.json'
+
+    @classmethod
+    def load(cls, path):
+        """
+        Open a saved rollup, or start an empty one if path does not exist
+        """
+        cube_path, meta_path = cls._paths(path)
+        if not os.path.exists(cube_path):
+            return cls()
+        if not os.path.exists(meta_path):
+            # Without the batch list, appending a batch again would count it twice
+            raise FileNotFoundError(f"{meta_path} is missing; it lists the batches already in {cube_path}")
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return cls(pd.read_feather(cube_path), meta['batches'])
+
+    def save(self, path):
+        cube_path, meta_path = self._paths(path)
+        os.makedirs(os.path.dirname(cube_path) or '.', exist_ok=True)
+        self.cube.to_feather(cube_path + '.tmp')
+        os.replace(cube_path + '.tmp', cube_path)
+        with open(meta_path + '.tmp', 'w') as f:
+            json.dump({'batches': self.batches, 'rows': int(self.cube['rows'].sum())}, f, indent=2)
+        os.replace(meta_path + '.tmp', meta_path)
+
+    @classmethod
+    def aggregate(cls, df):
+        """
+        Roll cleaned rows (date, product_name, region, quantity, revenue) up
+        to the cube's keys
+        """
+        dates = df['date']
+        if isinstance(dates.dtype, pd.ArrowDtype):
+            # pyarrow-backed dates (dtype_backend='pyarrow') have no to_period
+            dates = dates.astype('datetime64[ns]')
+        batch = pd.DataFrame({
+            'month': dates.dt.to_period('M').dt.to_timestamp(),
+            'product_name': df['product_name'],
+            'region': df['region'],
+            'hour': dates.dt.hour.astype('int8'),
+            'dayofweek': dates.dt.dayofweek.astype('int8'),
+            'revenue': df['revenue'].astype('float64'),
+            'quantity': df['quantity'].astype('float64'),
+            'rows': 1,
+        })
+        return batch.groupby(cls.keys, observed=True, sort=False)[cls.measures].sum().reset_index()
+
+    def append(self, df, batch_id=None):
+        """
+        Merge a batch of cleaned rows into the cube. A batch_id that was
+        already appended is skipped, so reloading the same file does not
+        count it twice. Returns True when the batch was added.
+        """
+        if batch_id is not None and batch_id in self.batches:
+            return False
+        combined = pd.concat([self.cube, self.aggregate(df)], ignore_index=True)
+        for column in ('product_name', 'region'):
+            combined[column] = combined[column].astype('category')
+        cube = combined.groupby(self.keys, observed=True)[self.measures].sum().reset_index()
+        cube['month'] = cube['month'].astype('datetime64[ns]')
+        cube['hour'] = cube['hour'].astype('int8')
+        cube['dayofweek'] = cube['dayofweek'].astype('int8')
+        self.cube = cube
+        if batch_id is not None:
+            self.batches.append(batch_id)
+        return True
+
+    def _totals(self, key):
+        totals = self.cube.groupby(key, observed=True)[['revenue', 'quantity']].sum()
+        if (totals['quantity'] % 1 == 0).all():
+            totals['quantity'] = totals['quantity'].astype('int64')
+        return totals
+
+    def monthly_sales(self):
+        """
+        Same frame as SalesAnalyzer.calculate_monthly_sales
+        """
+        return self._totals('month').reset_index().rename(columns={'month': 'date'})
+
+    def top_products(self, top_n=10):
+        """
+        Same frame as SalesAnalyzer.identify_top_products
+        """
+        return self._totals('product_name').nlargest(top_n, 'revenue')
+
+    def regional_performance(self):
+        """
+        Same frame as SalesAnalyzer.analyze_regional_performance
+        """
+        return self._totals('region').sort_values('revenue', ascending=False)
+
+    def heatmap_table(self):
+        """
+        Quantity per day of week (rows) and hour (columns), like the pivot
+        table in DataVisualizer.create_sales_heatmap
+        """
+        table = self.cube.groupby(['dayofweek', 'hour'])['quantity'].sum().unstack()
+        table.index = table.index.astype('int32').rename('date')
+        table.columns = table.columns.astype('int32').rename('date')
+        return table
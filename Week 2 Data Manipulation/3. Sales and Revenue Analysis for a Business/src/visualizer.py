@@ -1,52 +1,156 @@
-import matplotlib.pyplot as plt
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
 import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from rollup import SalesRollup
+
+# Part of every chart's hash; bump it when the drawing code changes so
+# existing PNGs are rendered again
+CHART_VERSION = 1
+
+def draw_monthly_trends(ax, monthly_sales):
+    ax.plot(monthly_sales['date'], monthly_sales['revenue'], marker='o')
+    ax.set_title('Monthly Sales Trends')
+    ax.set_xlabel('Month')
+    ax.set_ylabel('Revenue ($)')
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.set_xticks(monthly_sales['date'])
+    ax.set_xticklabels(monthly_sales['date'].dt.strftime('%Y-%m'), rotation=45)
+
+def draw_top_products(ax, top_products):
+    sns.barplot(data=top_products.reset_index(), x='product_name', y='revenue',
+                order=top_products.index, ax=ax)
+    ax.set_title('Top Products by Revenue')
+    ax.set_xlabel('Product')
+    ax.set_ylabel('Revenue')
+    ax.tick_params(axis='x', labelrotation=45)
+
+def draw_sales_heatmap(ax, pivot_table):
+    sns.heatmap(pivot_table, cmap='YlOrRd', annot=True, fmt='.0f', ax=ax)
+    ax.set_title('Sales Heatmap (Day of Week vs Hour)')
+    ax.set_xlabel('Hour of Day')
+    ax.set_ylabel('Day of Week')
+
+# Drawing function and figure size of each chart, by output file name
+CHARTS = {
+    'monthly_trends': (draw_monthly_trends, (12, 6)),
+    'top_products': (draw_top_products, (12, 6)),
+    'sales_heatmap': (draw_sales_heatmap, (12, 8)),
+}
+
+def render_chart(name, data, path):
+    """
+    Draw one chart on its own Agg figure (no pyplot state) and save it
+    """
+    draw, figsize = CHARTS[name]
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    draw(fig.add_subplot(), data)
+    fig.tight_layout()
+    fig.savefig(path)
+    return name
+
+def chart_hash(name, data):
+    """
+    Hash of a chart's input frame, its column names and types, and its
+    plot parameters
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    _, figsize = CHARTS[name]
+    digest.update(json.dumps([CHART_VERSION, name, figsize, list(map(str, data.columns)),
+                              list(map(str, data.dtypes)), str(data.index.dtype)]).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
 
 class DataVisualizer:
+    def __init__(self, output_dir='output', use_cache=True, workers=None):
+        """
+        Charts are written to output_dir as <name>.png with their input
+        hash in <name>.png.hash; with use_cache a chart whose hash matches
+        is not drawn again. workers is the process count of render_all.
+        """
+        self.output_dir = output_dir
+        self.use_cache = use_cache
+        self.workers = workers
+    
+    def _path(self, name):
+        return os.path.join(self.output_dir, f'{name}.png')
+    
+    def is_current(self, name, data):
+        """
+        Whether the PNG of a chart was last rendered from this data
+        """
+        path = self._path(name)
+        if not self.use_cache or not os.path.exists(path) or not os.path.exists(path + '.hash'):
+            return False
+        with open(path + '.hash') as f:
+            return f.read().strip() == chart_hash(name, data)
+    
+    def _save_hash(self, name, data):
+        path = self._path(name) + '.hash'
+        with open(path + '.tmp', 'w') as f:
+            f.write(chart_hash(name, data) + '\n')
+        os.replace(path + '.tmp', path)
+    
+    def render(self, charts):
+        """
+        Render the charts ({name: input frame}) whose inputs changed, in a
+        process pool when there is more than one. Returns the names rendered.
+        """
+        stale = {name: data for name, data in charts.items() if not self.is_current(name, data)}
+        os.makedirs(self.output_dir, exist_ok=True)
+        if len(stale) > 1 and self.workers != 1:
+            with ProcessPoolExecutor(min(self.workers or os.cpu_count() or 1, len(stale))) as executor:
+                list(executor.map(render_chart, stale, stale.values(), map(self._path, stale)))
+        else:
+            for name, data in stale.items():
+                render_chart(name, data, self._path(name))
+        for name, data in stale.items():
+            self._save_hash(name, data)
+        return list(stale)
+    
+    def render_all(self, monthly_sales, top_products, df):
+        """
+        Render the three report charts, skipping those that are up to date
+        """
+        return self.render({
+            'monthly_trends': monthly_sales,
+            'top_products': top_products,
+            'sales_heatmap': self.heatmap_table(df),
+        })
+    
     def plot_monthly_trends(self, monthly_sales):
         """
         Plot monthly sales trends
         """
-        plt.figure(figsize=(12, 6))
-        plt.plot(monthly_sales['date'], monthly_sales['revenue'], marker='o')
-        plt.title('Monthly Sales Trends')
-        plt.xlabel('Month')
-        plt.ylabel('Revenue ($)')
-        plt.grid(True, linestyle='--', alpha=0.7)
-        plt.xticks(monthly_sales['date'], monthly_sales['date'].dt.strftime('%Y-%m'), rotation=45)
-        plt.tight_layout()
-        plt.savefig('output/monthly_trends.png')
-        plt.close()
+        self.render({'monthly_trends': monthly_sales})
     
     def plot_top_products(self, top_products):
         """
         Create bar plot of top products
         """
-        plt.figure(figsize=(12, 6))
-        sns.barplot(data=top_products.reset_index(), x='product_name', y='revenue')
-        plt.title('Top Products by Revenue')
-        plt.xlabel('Product')
-        plt.ylabel('Revenue')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig('output/top_products.png')
-        plt.close()
+        self.render({'top_products': top_products})
     
     def create_sales_heatmap(self, df):
         """
-        Create heatmap for sales patterns
+        Create heatmap for sales patterns (df can also be a SalesRollup)
+        """
+        self.render({'sales_heatmap': self.heatmap_table(df)})
+    
+    @staticmethod
+    def heatmap_table(df):
+        """
+        Quantity per day of week (rows) and hour (columns)
         """
-        pivot_table = df.pivot_table(
+        if isinstance(df, SalesRollup):
+            return df.heatmap_table()
+        return df.pivot_table(
             values='quantity',
             index=df['date'].dt.dayofweek,
             columns=df['date'].dt.hour,
             aggfunc='sum'
         )
-        
-        plt.figure(figsize=(12, 8))
-        sns.heatmap(pivot_table, cmap='YlOrRd', annot=True, fmt='.0f')
-        plt.title('Sales Heatmap (Day of Week vs Hour)')
-        plt.xlabel('Hour of Day')
-        plt.ylabel('Day of Week')
-        plt.tight_layout()
-        plt.savefig('output/sales_heatmap.png')
-        plt.close()